@@ -5,8 +5,11 @@ import os
 from dataclasses import dataclass
 from typing import Optional
 
+# Default pool size for document loading and splitting
+DEFAULT_WORKERS = max((os.cpu_count() or 2) - 1, 1)
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class APIConfig:
     """API configuration settings."""
     groq_api_key: str
@@ -15,36 +18,60 @@ class APIConfig:
     groq_timeout: int = 30
     groq_temperature: float = 0.1
     groq_max_tokens: int = 1000
+    max_concurrency: int = 4  # Concurrent Groq requests for batch queries
+    keepalive_interval: int = 45  # Seconds between connection keep-alive pings, 0 disables
+    
+    @property
+    def chat_url(self) -> str:
+        """Chat completions endpoint URL."""
+        return f"{self.groq_base_url}/chat/completions"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OllamaConfig:
     """Ollama configuration settings."""
     model: str = "nomic-embed-text"
     base_url: str = "http://localhost:11434"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class VectorStoreConfig:
     """Vector store configuration."""
     chroma_dir: str = "./chroma_db"
-    chunk_size: int = 1000
-    chunk_overlap: int = 200
+    # Recursive chunking without overlap retrieves as well as or better than
+    # 20-80% overlap, and stores no duplicated text; use 80 (10%) if needed
+    chunk_size: int = 800
+    chunk_overlap: int = 0
+    child_chunk_size: int = 200  # Retrieval chunk size within each parent chunk, 0 disables
     similarity_search_k: int = 3
+    index_precision: str = "float32"  # In-memory index vectors: float32, float16 or int8
+    rerank_factor: int = 4  # Int8-index candidates per result, reranked exactly
+    embedding_cache_path: str = "./chroma_db/embedding_cache.sqlite3"
+    embed_batch_size: int = 32  # Chunks embedded per Ollama request
+    embed_concurrency: int = 4  # Embedding requests in flight at once
+    insert_batch_size: int = 512  # Chunks embedded and stored per insert window
+
 
+@dataclass(frozen=True, slots=True)
+class ProcessingConfig:
+    """Document processing configuration."""
+    load_workers: int = DEFAULT_WORKERS  # Threads used to load files
+    split_workers: int = DEFAULT_WORKERS  # Processes used to split documents
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class LanguageConfig:
     """Language detection configuration."""
     hindi_threshold: float = 0.3  # Threshold for Hindi character ratio
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppConfig:
-    """Main application configuration."""
+    """Main application configuration, immutable once loaded at startup."""
     api: APIConfig
     ollama: OllamaConfig
     vectorstore: VectorStoreConfig
+    processing: ProcessingConfig
     language: LanguageConfig
     
     @classmethod
@@ -62,7 +89,9 @@ class AppConfig:
                 groq_base_url=os.getenv('GROQ_BASE_URL', 'https://api.groq.com/openai/v1'),
                 groq_timeout=int(os.getenv('GROQ_TIMEOUT', '30')),
                 groq_temperature=float(os.getenv('GROQ_TEMPERATURE', '0.1')),
-                groq_max_tokens=int(os.getenv('GROQ_MAX_TOKENS', '1000'))
+                groq_max_tokens=int(os.getenv('GROQ_MAX_TOKENS', '1000')),
+                max_concurrency=int(os.getenv('GROQ_MAX_CONCURRENCY', '4')),
+                keepalive_interval=int(os.getenv('GROQ_KEEPALIVE_INTERVAL', '45'))
             ),
             ollama=OllamaConfig(
                 model=os.getenv('OLLAMA_MODEL', 'nomic-embed-text'),
@@ -70,9 +99,20 @@ class AppConfig:
             ),
             vectorstore=VectorStoreConfig(
                 chroma_dir=os.getenv('CHROMA_DIR', './chroma_db'),
-                chunk_size=int(os.getenv('CHUNK_SIZE', '1000')),
-                chunk_overlap=int(os.getenv('CHUNK_OVERLAP', '200')),
-                similarity_search_k=int(os.getenv('SIMILARITY_SEARCH_K', '3'))
+                chunk_size=int(os.getenv('CHUNK_SIZE', '800')),
+                chunk_overlap=int(os.getenv('CHUNK_OVERLAP', '0')),
+                child_chunk_size=int(os.getenv('CHILD_CHUNK_SIZE', '200')),
+                similarity_search_k=int(os.getenv('SIMILARITY_SEARCH_K', '3')),
+                index_precision=os.getenv('INDEX_PRECISION', 'float32'),
+                rerank_factor=int(os.getenv('RERANK_FACTOR', '4')),
+                embedding_cache_path=os.getenv('EMBEDDING_CACHE_PATH', './chroma_db/embedding_cache.sqlite3'),
+                embed_batch_size=int(os.getenv('EMBED_BATCH_SIZE', '32')),
+                embed_concurrency=int(os.getenv('EMBED_CONCURRENCY', '4')),
+                insert_batch_size=int(os.getenv('INSERT_BATCH_SIZE', '512'))
+            ),
+            processing=ProcessingConfig(
+                load_workers=int(os.getenv('LOAD_WORKERS', str(DEFAULT_WORKERS))),
+                split_workers=int(os.getenv('SPLIT_WORKERS', str(DEFAULT_WORKERS)))
             ),
             language=LanguageConfig(
                 hindi_threshold=float(os.getenv('HINDI_THRESHOLD', '0.3'))
@@ -1,29 +1,131 @@
 """
 Document processing module for loading and splitting documents.
 """
-from typing import List, Tuple, Any
+import hashlib
+import importlib.util
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from itertools import chain
+from typing import List, Tuple, Any, Optional
+
+import numpy as np
+
 from config import config
 from utils import ErrorHandler
 
-# Import with error handling
-try:
+logger = logging.getLogger(__name__)
+
+# LangChain loaders and splitters are imported on first use: they are slow
+# to import and not needed until a document is actually processed.
+
+# Optional Rust-backed splitter, used when installed
+HAS_NATIVE_SPLITTER = importlib.util.find_spec("semantic_text_splitter") is not None
+
+# Below this many characters (roughly a thousand pages), starting worker
+# processes and pickling documents to them costs more than splitting in-process
+PARALLEL_SPLIT_MIN_CHARS = 2_000_000
+
+
+@lru_cache(maxsize=None)
+def _build_text_splitter(chunk_size: int, chunk_overlap: int) -> Any:
+    """
+    Build a text splitter for fixed chunk settings.
+    
+    Chunk settings are fixed at startup, so each process builds its splitter
+    once and reuses it for every DocumentProcessor and worker shard.
+    
+    Args:
+        chunk_size (int): Maximum chunk size in characters
+        chunk_overlap (int): Overlap between consecutive chunks
+        
+    Returns:
+        Any: Rust-backed TextSplitter if installed, else RecursiveCharacterTextSplitter
+    """
+    if HAS_NATIVE_SPLITTER:
+        from semantic_text_splitter import TextSplitter
+        
+        # Character capacity range: fill chunks up to chunk_size, and
+        # leave room for the overlap carried over from the previous chunk
+        return TextSplitter(
+            (max(chunk_size - chunk_overlap, 1), chunk_size),
+            overlap=chunk_overlap
+        )
+    
     from langchain.text_splitter import RecursiveCharacterTextSplitter
-    from langchain_community.document_loaders import PyPDFLoader, TextLoader
-except ImportError as e:
-    raise ImportError(f"Required packages not installed: {e}")
+    
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len
+    )
+
+
+def _load_pdf(file_path: str) -> Any:
+    """
+    Create a PDF loader.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        
+    Returns:
+        Any: PyPDFLoader instance
+    """
+    from langchain_community.document_loaders import PyPDFLoader
+    return PyPDFLoader(file_path)
+
+
+def _load_text(file_path: str) -> Any:
+    """
+    Create a UTF-8 text loader.
+    
+    Args:
+        file_path (str): Path to the text file
+        
+    Returns:
+        Any: TextLoader instance
+    """
+    from langchain_community.document_loaders import TextLoader
+    return TextLoader(file_path, encoding='utf-8')
+
+
+def _split_shard(documents: List[Any]) -> List[Any]:
+    """
+    Split a shard of documents in a worker process.
+    
+    Args:
+        documents (List[Any]): Shard of documents to split
+        
+    Returns:
+        List[Any]: List of document chunks
+    """
+    return DocumentProcessor().split_documents(documents)
 
 
 class DocumentProcessor:
     """Handle document loading and processing."""
     
+    # Loader factory per file extension
+    _LOADERS = {
+        '.pdf': _load_pdf,
+        '.txt': _load_text
+    }
+    _supported_formats_set = frozenset(_LOADERS)
+    
     def __init__(self):
         """Initialize document processor."""
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=config.vectorstore.chunk_size,
-            chunk_overlap=config.vectorstore.chunk_overlap,
-            length_function=len
+        self.use_native_splitter = HAS_NATIVE_SPLITTER
+        self.supported_formats = list(self._LOADERS)
+    
+    @cached_property
+    def text_splitter(self) -> Any:
+        """Text splitter for the configured chunk settings, built on first use."""
+        return _build_text_splitter(
+            config.vectorstore.chunk_size,
+            config.vectorstore.chunk_overlap
         )
-        self.supported_formats = ['.pdf', '.txt']
     
     def load_documents(self, file_paths: List[str]) -> Tuple[List[Any], List[str]]:
         """
@@ -38,23 +140,45 @@ class DocumentProcessor:
         documents = []
         errors = []
         
-        for file_path in file_paths:
-            try:
-                loader = self._get_loader(file_path)
-                if loader:
-                    docs = loader.load()
-                    documents.extend(docs)
-                    print(f"✅ Loaded: {file_path}")
+        if not file_paths:
+            return documents, errors
+        
+        # Loading is dominated by file I/O and PDF parsing, so overlap files
+        # on a thread pool; map() keeps results in input order
+        max_workers = max(min(config.processing.load_workers, len(file_paths)), 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for docs, error in pool.map(self._load_one, file_paths):
+                if error:
+                    errors.append(error)
                 else:
-                    errors.append(f"Unsupported file type: {file_path}")
-                    
-            except Exception as e:
-                error_msg = f"Error loading {file_path}: {str(e)}"
-                errors.append(error_msg)
-                print(f"❌ {error_msg}")
+                    documents.extend(docs)
         
         return documents, errors
     
+    def _load_one(self, file_path: str) -> Tuple[List[Any], Optional[str]]:
+        """
+        Load a single document file.
+        
+        Args:
+            file_path (str): Path to the file
+            
+        Returns:
+            Tuple[List[Any], Optional[str]]: (documents, error)
+        """
+        try:
+            loader = self._get_loader(file_path)
+            if not loader:
+                return [], f"Unsupported file type: {file_path}"
+            
+            docs = loader.load()
+            logger.info("Loaded: %s", file_path)
+            return docs, None
+            
+        except Exception as e:
+            error_msg = f"Error loading {file_path}: {str(e)}"
+            logger.error("%s", error_msg)
+            return [], error_msg
+    
     def _get_loader(self, file_path: str):
         """
         Get appropriate document loader based on file extension.
@@ -65,14 +189,8 @@ class DocumentProcessor:
         Returns:
             Document loader or None
         """
-        file_extension = '.' + file_path.split('.')[-1].lower()
-        
-        if file_extension == '.pdf':
-            return PyPDFLoader(file_path)
-        elif file_extension == '.txt':
-            return TextLoader(file_path, encoding='utf-8')
-        else:
-            return None
+        loader_factory = self._LOADERS.get(os.path.splitext(file_path)[1].lower())
+        return loader_factory(file_path) if loader_factory else None
     
     def split_documents(self, documents: List[Any]) -> List[Any]:
         """
@@ -88,14 +206,111 @@ class DocumentProcessor:
             return []
         
         try:
-            splits = self.text_splitter.split_documents(documents)
-            print(f"✅ Split {len(documents)} documents into {len(splits)} chunks")
+            splits = self._split_with(self.text_splitter, documents)
+            logger.info("Split %d documents into %d chunks", len(documents), len(splits))
             return splits
             
         except Exception as e:
-            print(f"❌ Error splitting documents: {str(e)}")
+            logger.error("Error splitting documents: %s", e)
             raise e
     
+    def split_documents_parallel(self, documents: List[Any], workers: Optional[int] = None) -> List[Any]:
+        """
+        Split documents across a process pool.
+        
+        Splitting is pure CPU work with no shared state, so large batches are
+        partitioned into contiguous shards and split in parallel. Batches
+        under PARALLEL_SPLIT_MIN_CHARS characters are split in-process.
+        
+        Args:
+            documents (List[Any]): List of documents to split
+            workers (Optional[int]): Number of worker processes, defaults to config
+            
+        Returns:
+            List[Any]: List of document chunks, in document order
+        """
+        workers = min(workers or config.processing.split_workers, len(documents))
+        
+        if workers <= 1 or sum(len(doc.page_content) for doc in documents) < PARALLEL_SPLIT_MIN_CHARS:
+            return self.split_documents(documents)
+        
+        shard_size = -(-len(documents) // workers)
+        shards = [documents[i:i + shard_size] for i in range(0, len(documents), shard_size)]
+        
+        try:
+            # Spawn fresh workers: forking the multi-threaded Streamlit server
+            # can deadlock the children on locks held by other threads
+            spawn = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=spawn) as pool:
+                splits = list(chain.from_iterable(pool.map(_split_shard, shards)))
+            logger.info("Split %d documents into %d chunks using %d processes", len(documents), len(splits), workers)
+            return splits
+            
+        except Exception as e:
+            logger.warning("Parallel splitting failed, splitting in-process: %s", e)
+            return self.split_documents(documents)
+    
+    def split_children(self, parents: List[Any]) -> List[Any]:
+        """
+        Split parent chunks into small child chunks for retrieval.
+        
+        Each parent gets a content-hash 'parent_id' in its metadata, which
+        its children inherit, so a matched child can be mapped back to the
+        larger parent passed to the LLM.
+        
+        Args:
+            parents (List[Any]): List of parent chunks
+            
+        Returns:
+            List[Any]: List of child chunks
+        """
+        if not parents:
+            return []
+        
+        for parent, parent_id in zip(parents, self.hash_chunks(parents)):
+            parent.metadata['parent_id'] = parent_id
+        
+        child_splitter = _build_text_splitter(config.vectorstore.child_chunk_size, 0)
+        children = self._split_with(child_splitter, parents)
+        logger.info("Split %d parent chunks into %d child chunks", len(parents), len(children))
+        return children
+    
+    def _split_with(self, splitter: Any, documents: List[Any]) -> List[Any]:
+        """
+        Split documents with the given splitter.
+        
+        Args:
+            splitter (Any): Splitter built by _build_text_splitter
+            documents (List[Any]): List of documents to split
+            
+        Returns:
+            List[Any]: List of document chunks with source metadata
+        """
+        if self.use_native_splitter:
+            return self._split_native(splitter, documents)
+        return splitter.split_documents(documents)
+    
+    def _split_native(self, splitter: Any, documents: List[Any]) -> List[Any]:
+        """
+        Split documents with the Rust-backed splitter in a single batch call.
+        
+        Args:
+            splitter (Any): Rust-backed TextSplitter
+            documents (List[Any]): List of documents to split
+            
+        Returns:
+            List[Any]: List of document chunks with source metadata
+        """
+        from langchain.schema import Document
+        
+        chunk_lists = splitter.chunk_all([doc.page_content for doc in documents])
+        
+        return [
+            Document(page_content=chunk, metadata=dict(doc.metadata))
+            for doc, chunks in zip(documents, chunk_lists)
+            for chunk in chunks
+        ]
+    
     def process_documents(self, file_paths: List[str]) -> Tuple[bool, str, List[Any]]:
         """
         Complete document processing pipeline.
@@ -112,13 +327,13 @@ class DocumentProcessor:
             
             if load_errors:
                 error_msg = "Some files failed to load:\n" + "\n".join(load_errors)
-                print(f"⚠️ {error_msg}")
+                logger.warning("%s", error_msg)
             
             if not documents:
                 return False, "No documents loaded successfully", []
             
             # Split documents
-            splits = self.split_documents(documents)
+            splits = self.split_documents_parallel(documents)
             
             if not splits:
                 return False, "No document chunks created", []
@@ -133,30 +348,54 @@ class DocumentProcessor:
             error_msg = ErrorHandler.handle_processing_error(e)
             return False, error_msg, []
     
-    def get_document_stats(self, documents: List[Any]) -> dict:
+    def hash_chunks(self, splits: List[Any]) -> List[str]:
+        """
+        Compute content hashes for document chunks.
+        
+        Args:
+            splits (List[Any]): List of document chunks
+            
+        Returns:
+            List[str]: Hex digest of each chunk's text, in chunk order
+        """
+        return [
+            hashlib.blake2b(chunk.page_content.encode('utf-8'), digest_size=16).hexdigest()
+            for chunk in splits
+        ]
+    
+    def get_document_stats(self, documents: Optional[List[Any]] = None,
+                           chunk_lengths: Optional[np.ndarray] = None) -> dict:
         """
         Get statistics about processed documents.
         
         Args:
-            documents (List[Any]): List of processed documents
+            documents (Optional[List[Any]]): List of processed documents, used
+                when chunk_lengths is not given
+            chunk_lengths (Optional[np.ndarray]): Precomputed chunk lengths, if available
             
         Returns:
             dict: Document statistics
         """
-        if not documents:
+        if chunk_lengths is None:
+            chunk_lengths = np.fromiter(
+                map(len, [doc.page_content for doc in documents]),
+                dtype=np.int64,
+                count=len(documents)
+            )
+        
+        if not chunk_lengths.size:
             return {
                 'total_chunks': 0,
                 'total_characters': 0,
                 'average_chunk_size': 0
             }
         
-        total_chars = sum(len(doc.page_content) for doc in documents)
-        avg_chunk_size = total_chars // len(documents) if documents else 0
+        total_chars = int(chunk_lengths.sum())
         
         return {
-            'total_chunks': len(documents),
+            'total_chunks': int(chunk_lengths.size),
             'total_characters': total_chars,
-            'average_chunk_size': avg_chunk_size
+            'average_chunk_size': total_chars // int(chunk_lengths.size)
         }
     
     def validate_file_format(self, filename: str) -> bool:
@@ -169,8 +408,7 @@ class DocumentProcessor:
         Returns:
             bool: True if supported
         """
-        file_extension = '.' + filename.split('.')[-1].lower()
-        return file_extension in self.supported_formats
+        return os.path.splitext(filename)[1].lower() in self._supported_formats_set
     
     def get_supported_formats(self) -> List[str]:
         """
@@ -0,0 +1,97 @@
+"""
+Persistent embedding cache keyed by chunk content hash.
+"""
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """SQLite-backed cache of chunk embeddings, keyed by (content hash, model)."""
+    
+    def __init__(self, path: str):
+        """
+        Initialize the embedding cache.
+        
+        Args:
+            path (str): Path to the SQLite database file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vec BLOB NOT NULL,
+                PRIMARY KEY (hash, model)
+            )
+            """
+        )
+        self._conn.commit()
+    
+    def get_many(self, hashes: List[str], model: str) -> Dict[str, np.ndarray]:
+        """
+        Look up cached embeddings for a batch of content hashes.
+        
+        Args:
+            hashes (List[str]): Content hashes to look up
+            model (str): Embedding model name
+            
+        Returns:
+            Dict[str, np.ndarray]: float32 embeddings for the hashes found in the cache
+        """
+        found = {}
+        unique_hashes = list(dict.fromkeys(hashes))
+        
+        # Stay well below SQLite's bound-parameter limit
+        batch_size = 500
+        with self._lock:
+            for i in range(0, len(unique_hashes), batch_size):
+                batch = unique_hashes[i:i + batch_size]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, vec FROM embedding_cache WHERE model = ? AND hash IN ({placeholders})",
+                    [model, *batch]
+                )
+                for content_hash, vec in rows:
+                    found[content_hash] = np.frombuffer(vec, dtype=np.float32)
+        
+        return found
+    
+    def put_many(self, items: Iterable[Tuple[str, List[float]]], model: str) -> None:
+        """
+        Store embeddings for a batch of content hashes.
+        
+        Args:
+            items (Iterable[Tuple[str, List[float]]]): (hash, embedding) pairs
+            model (str): Embedding model name
+        """
+        rows = []
+        for content_hash, embedding in items:
+            vec = np.asarray(embedding, dtype=np.float32)
+            rows.append((content_hash, model, int(vec.shape[0]), vec.tobytes()))
+        
+        if not rows:
+            return
+        
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (hash, model, dim, vec) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,10 +1,15 @@
 """
 Groq API client for chat completions with language support.
 """
+import io
+import json
+import threading
 import requests
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from typing import Any, Iterable, Iterator, Optional
+from urllib3.util.retry import Retry
 from config import config
-from utils import get_system_prompts, ErrorHandler
+from utils import get_prompt_templates, ErrorHandler
 
 
 class GroqClient:
@@ -18,16 +23,27 @@ class GroqClient:
             api_key (Optional[str]): Groq API key, defaults to config
             model (Optional[str]): Model name, defaults to config
         """
-        self.api_key = api_key or config.api.groq_api_key
-        self.model = model or config.api.groq_model
-        self.base_url = config.api.groq_base_url
-        self.timeout = config.api.groq_timeout
-        self.temperature = config.api.groq_temperature
-        self.max_tokens = config.api.groq_max_tokens
-        self.system_prompts = get_system_prompts()
+        api_config = config.api
+        self.api_key = api_key or api_config.groq_api_key
+        self.model = model or api_config.groq_model
+        self.base_url = api_config.groq_base_url
+        self.timeout = api_config.groq_timeout
+        self.temperature = api_config.groq_temperature
+        self.max_tokens = api_config.groq_max_tokens
+        self._prompt_templates = get_prompt_templates()
         
         if not self.api_key:
             raise ValueError("Groq API key is required")
+        
+        # Precompute per-request strings once
+        self._chat_url = api_config.chat_url
+        self._auth_header = f"Bearer {self.api_key}"
+        
+        # Reuse keep-alive connections across questions instead of paying a
+        # TCP + TLS handshake on every request
+        self._session = self._create_session()
+        self._keepalive_stop = threading.Event()
+        self._keepalive_thread = None
     
     def _create_headers(self) -> dict:
         """
@@ -37,41 +53,80 @@ class GroqClient:
             dict: Request headers
         """
         return {
-            "Authorization": f"Bearer {self.api_key}",
+            "Authorization": self._auth_header,
             "Content-Type": "application/json"
         }
     
-    def _create_prompt(self, question: str, context: str = "", language: str = "english") -> str:
+    def _create_session(self) -> requests.Session:
+        """
+        Create a pooled HTTP session with retries on transient errors.
+        
+        Returns:
+            requests.Session: Configured session
         """
-        Create language-specific prompt.
+        session = requests.Session()
+        session.headers.update(self._create_headers())
+        
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=None,  # Chat completions are POSTs
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        
+        return session
+    
+    def build_prompt(self, question: str, contexts: Iterable[Any] = (), language: str = "english") -> str:
+        """
+        Build the language-specific prompt from context texts or documents.
+        
+        Writes the instructions, each context text and the question into one
+        buffer, instead of joining a context string first and copying it
+        again into the prompt.
         
         Args:
             question (str): User question
-            context (str): Context from documents
+            contexts (Iterable[Any]): Context strings or retrieved documents
             language (str): Target language
             
         Returns:
             str: Formatted prompt
         """
-        system_instruction = self.system_prompts.get(language, self.system_prompts['english'])
+        prefix, context_label, question_label, answer_suffix = self._prompt_templates.get(
+            language, self._prompt_templates['english']
+        )
         
-        if language == "hindi":
-            if context:
-                return f"{system_instruction}\n\nसंदर्भ (Context): {context}\n\nप्रश्न: {question}\n\nउत्तर (केवल हिंदी में):"
-            else:
-                return f"{system_instruction}\n\nप्रश्न: {question}\n\nउत्तर (केवल हिंदी में):"
-        else:
-            if context:
-                return f"{system_instruction}\n\nContext: {context}\n\nQuestion: {question}\n\nAnswer (in English only):"
-            else:
-                return f"{system_instruction}\n\nQuestion: {question}\n\nAnswer (in English only):"
+        buf = io.StringIO()
+        buf.write(prefix)
+        
+        has_context = False
+        for context in contexts:
+            text = context.page_content if hasattr(context, 'page_content') else context
+            if not text:
+                continue
+            buf.write("\n\n" if has_context else context_label)
+            buf.write(text)
+            has_context = True
+        
+        if has_context:
+            buf.write("\n\n")
+        buf.write(question_label)
+        buf.write(question)
+        buf.write(answer_suffix)
+        
+        return buf.getvalue()
     
-    def _create_request_data(self, prompt: str) -> dict:
+    def _create_request_data(self, prompt: str, stream: bool = False) -> dict:
         """
         Create request data for API call.
         
         Args:
             prompt (str): Formatted prompt
+            stream (bool): Whether to request a server-sent event stream
             
         Returns:
             dict: Request data
@@ -80,7 +135,8 @@ class GroqClient:
             "model": self.model,
             "messages": [{"role": "user", "content": prompt}],
             "temperature": self.temperature,
-            "max_tokens": self.max_tokens
+            "max_tokens": self.max_tokens,
+            "stream": stream
         }
     
     def chat(self, prompt: str, context: str = "", language: str = "english") -> str:
@@ -95,40 +151,90 @@ class GroqClient:
         Returns:
             str: AI response or error message
         """
-        try:
-            # Create language-specific prompt
-            full_prompt = self._create_prompt(prompt, context, language)
+        return "".join(self.chat_stream(prompt, context, language))
+    
+    def chat_stream(self, prompt: str, context: str = "", language: str = "english") -> Iterator[str]:
+        """
+        Streaming chat completion with language-aware prompting.
+        
+        Tokens are yielded as soon as Groq sends them, so callers can render
+        the answer before generation finishes.
+        
+        Args:
+            prompt (str): User prompt/question
+            context (str): Context from documents
+            language (str): Target language ('hindi' or 'english')
+            
+        Returns:
+            Iterator[str]: Response text fragments, or a single error message
+        """
+        full_prompt = self.build_prompt(prompt, (context,), language)
+        return self.complete_stream(full_prompt, language)
+    
+    def complete(self, full_prompt: str, language: str = "english") -> str:
+        """
+        Chat completion for an already formatted prompt.
+        
+        Args:
+            full_prompt (str): Complete prompt including instructions and context
+            language (str): Language for error messages
             
+        Returns:
+            str: AI response or error message
+        """
+        return "".join(self.complete_stream(full_prompt, language))
+    
+    def complete_stream(self, full_prompt: str, language: str = "english") -> Iterator[str]:
+        """
+        Streaming chat completion for an already formatted prompt.
+        
+        Args:
+            full_prompt (str): Complete prompt including instructions and context
+            language (str): Language for error messages
+            
+        Yields:
+            str: Response text fragments, or a single error message
+        """
+        try:
             # Prepare request
-            headers = self._create_headers()
-            data = self._create_request_data(full_prompt)
+            data = self._create_request_data(full_prompt, stream=True)
             
-            # Make API call
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
+            # Make API call over the pooled session
+            with self._session.post(
+                self._chat_url,
                 json=data,
-                timeout=self.timeout
-            )
-            
-            # Handle response
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
-            else:
-                error_msg = f"API Error {response.status_code}: {response.text}"
-                return ErrorHandler.handle_api_error(Exception(error_msg), language)
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                
+                if response.status_code != 200:
+                    error_msg = f"API Error {response.status_code}: {response.text}"
+                    yield ErrorHandler.handle_api_error(Exception(error_msg), language)
+                    return
+                
+                # Parse server-sent events: "data: {...}" lines, ending with "data: [DONE]"
+                for line in response.iter_lines():
+                    if not line.startswith(b"data: "):
+                        continue
+                    
+                    payload = line[len(b"data: "):]
+                    if payload == b"[DONE]":
+                        break
+                    
+                    content = json.loads(payload)["choices"][0]["delta"].get("content")
+                    if content:
+                        yield content
                 
         except requests.exceptions.Timeout:
             error = Exception("Request timed out")
-            return ErrorHandler.handle_connection_error(error, language)
+            yield ErrorHandler.handle_connection_error(error, language)
             
         except requests.exceptions.ConnectionError:
             error = Exception("Failed to connect to Groq API")
-            return ErrorHandler.handle_connection_error(error, language)
+            yield ErrorHandler.handle_connection_error(error, language)
             
         except Exception as e:
-            return ErrorHandler.handle_api_error(e, language)
+            yield ErrorHandler.handle_api_error(e, language)
     
     def test_connection(self) -> tuple[bool, str]:
         """
@@ -148,6 +254,50 @@ class GroqClient:
         except Exception as e:
             return False, f"Groq API connection failed: {str(e)}"
     
+    def start_keepalive(self, interval: int) -> None:
+        """
+        Keep the pooled connection warm with periodic background pings.
+        
+        Idle keep-alive connections are eventually closed by the server, and
+        the next question then pays the TCP + TLS handshake again.
+        
+        Args:
+            interval (int): Seconds between pings, 0 disables
+        """
+        if interval <= 0 or self._keepalive_thread is not None:
+            return
+        
+        self._keepalive_thread = threading.Thread(
+            target=self._keepalive,
+            args=(interval,),
+            name="groq-keepalive",
+            daemon=True
+        )
+        self._keepalive_thread.start()
+    
+    def stop_keepalive(self) -> None:
+        """Stop the background keep-alive pings."""
+        self._keepalive_stop.set()
+    
+    def close(self) -> None:
+        """Stop the keep-alive pings and close the HTTP session."""
+        self.stop_keepalive()
+        self._session.close()
+    
+    def _keepalive(self, interval: int) -> None:
+        """
+        Ping the models endpoint until stopped.
+        
+        Args:
+            interval (int): Seconds between pings
+        """
+        while not self._keepalive_stop.wait(interval):
+            try:
+                self._session.get(f"{self.base_url}/models", timeout=5).close()
+            except requests.exceptions.RequestException:
+                # The next real request will reconnect on its own
+                pass
+    
     def get_model_info(self) -> dict:
         """
         Get information about the current model.
@@ -2,16 +2,30 @@
 Main application entry point for the RAG Chatbot.
 """
 import streamlit as st
+import logging
 import warnings
 import os
+from typing import Optional, Tuple
 
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
     load_dotenv()  # Load .env file
-    print("✅ Environment variables loaded from .env file")
+    dotenv_loaded = True
 except ImportError:
-    print("⚠️  python-dotenv not installed, using system environment variables")
+    dotenv_loaded = False
+
+# Configure logging once for the whole application
+logging.basicConfig(
+    level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+if dotenv_loaded:
+    logger.info("Environment variables loaded from .env file")
+else:
+    logger.warning("python-dotenv not installed, using system environment variables")
 
 from rag_system import RAGSystem
 from ui_components import UIComponents
@@ -20,20 +34,14 @@ from config import config
 # Suppress warnings
 warnings.filterwarnings("ignore")
 
-# Print import status for debugging
-print("✅ Starting RAG Chatbot Application")
-print(f"✅ Configuration loaded - Groq Model: {config.api.groq_model}")
-print(f"✅ Configuration loaded - Ollama Model: {config.ollama.model}")
+# Log startup configuration for debugging
+logger.info("Starting RAG Chatbot Application")
+logger.info("Configuration loaded - Groq Model: %s", config.api.groq_model)
+logger.info("Configuration loaded - Ollama Model: %s", config.ollama.model)
 
 
 def initialize_session_state():
     """Initialize Streamlit session state variables."""
-    if 'rag_system' not in st.session_state:
-        st.session_state.rag_system = None
-    
-    if 'initialization_attempted' not in st.session_state:
-        st.session_state.initialization_attempted = False
-    
     if 'messages' not in st.session_state:
         st.session_state.messages = []
     
@@ -41,25 +49,32 @@ def initialize_session_state():
         st.session_state.document_count = 0
 
 
-def initialize_rag_system():
-    """Initialize the RAG system with error handling."""
-    if st.session_state.rag_system is None:
-        st.session_state.rag_system = RAGSystem()
+@st.cache_resource(show_spinner="Initializing RAG system...")
+def get_rag_system() -> Tuple[RAGSystem, bool, str]:
+    """
+    Create and initialize the RAG system once per server process.
     
-    if not st.session_state.initialization_attempted:
-        st.session_state.initialization_attempted = True
-        
-        with st.spinner("Initializing RAG system..."):
-            success, message = st.session_state.rag_system.initialize()
-            
-            if success:
-                st.success(f"✅ {message}")
-                return True
-            else:
-                st.error(f"❌ Initialization failed: {message}")
-                return False
+    Returns:
+        Tuple[RAGSystem, bool, str]: (rag_system, success, message)
+    """
+    rag_system = RAGSystem()
+    success, message = rag_system.initialize()
+    return rag_system, success, message
+
+
+def initialize_rag_system() -> Optional[RAGSystem]:
+    """Get the shared RAG system, reporting initialization errors."""
+    rag_system, success, message = get_rag_system()
     
-    return st.session_state.rag_system.is_initialized
+    if not success:
+        st.error(f"❌ Initialization failed: {message}")
+        # Don't cache the failure, retry on the next rerun with a fresh
+        # system; close this one so its threads and connections don't leak
+        rag_system.close()
+        get_rag_system.clear()
+        return None
+    
+    return rag_system
 
 
 def show_api_key_warning():
@@ -91,19 +106,11 @@ def main():
     # Initialize session state
     initialize_session_state()
     
-    # Create UI components
-    if st.session_state.rag_system:
-        ui = UIComponents(st.session_state.rag_system)
-    else:
-        # Create temporary UI for initialization
-        temp_rag = RAGSystem()
-        ui = UIComponents(temp_rag)
-    
     # Render header
-    ui.render_header()
+    UIComponents.render_header()
     
     # Render language demo
-    ui.render_language_demo()
+    UIComponents.render_language_demo()
     
     # Check API key configuration
     try:
@@ -117,25 +124,29 @@ def main():
         st.stop()
     
     # Initialize RAG system
-    if not initialize_rag_system():
+    rag_system = initialize_rag_system()
+    if rag_system is None:
         st.stop()
     
-    # Update UI with initialized RAG system
-    ui = UIComponents(st.session_state.rag_system)
+    # Create UI components
+    ui = UIComponents(rag_system)
     
     # Check if system is properly initialized
     if not ui.check_initialization():
         st.stop()
     
-    # Render main interface
+    # Render sidebar
     ui.render_sidebar()
-    ui.render_chat_interface()
     
     # Render troubleshooting section
     ui.render_troubleshooting()
     
     # Footer with system status
     render_footer(ui)
+    
+    # Chat goes last: its input sits inline at the end of the chat fragment
+    # rather than pinned, so it must stay the bottom element of the page
+    ui.render_chat_interface()
 
 
 def render_footer(ui):
@@ -145,14 +156,14 @@ def render_footer(ui):
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        status = st.session_state.rag_system.get_system_status()
+        status = ui.rag_system.get_system_status()
         if status['is_initialized']:
             st.success("🟢 System Ready")
         else:
             st.error("🔴 System Not Ready")
     
     with col2:
-        doc_count = st.session_state.rag_system.vector_store.get_document_count()
+        doc_count = ui.rag_system.vector_store.get_document_count()
         st.info(f"📄 Documents: {doc_count}")
     
     with col3:
@@ -169,7 +180,7 @@ def render_footer(ui):
                     'Similarity K': config.vectorstore.similarity_search_k,
                     'API Key Set': bool(config.api.groq_api_key)  # Don't show actual key!
                 },
-                'System Status': st.session_state.rag_system.get_system_status(),
+                'System Status': ui.rag_system.get_system_status(),
                 'Session State Keys': list(st.session_state.keys())
             }
             st.json(debug_info)
@@ -0,0 +1,146 @@
+"""
+Ollama embeddings over a persistent HTTP session.
+"""
+import atexit
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+# orjson parses the float arrays in embedding responses several times
+# faster than the standard library; it is optional
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+try:
+    from langchain_core.embeddings import Embeddings
+except ImportError as e:
+    raise ImportError(f"Required packages not installed: {e}")
+
+# Embedding a large batch can take a while on CPU-only Ollama hosts
+EMBED_TIMEOUT = 120
+
+
+class OllamaBatchEmbeddings(Embeddings):
+    """LangChain embeddings backed by Ollama's batch /api/embed endpoint."""
+    
+    def __init__(self, model: str, base_url: str, batch_size: int = 32, concurrency: int = 4):
+        """
+        Initialize the embeddings client.
+        
+        Args:
+            model (str): Ollama embedding model
+            base_url (str): Ollama server URL
+            batch_size (int): Texts sent per request
+            concurrency (int): Requests in flight at once
+        """
+        self.model = model
+        self.base_url = base_url.rstrip('/')
+        self.batch_size = max(batch_size, 1)
+        self.concurrency = max(concurrency, 1)
+        
+        # One keep-alive session for every call, sized for concurrent batches
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        atexit.register(self._session.close)
+    
+    def close(self) -> None:
+        """Close the HTTP session."""
+        self._session.close()
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts in batches.
+        
+        Args:
+            texts (List[str]): Texts to embed
+            
+        Returns:
+            List[List[float]]: Embeddings in text order
+        """
+        return self.embed_array(texts).tolist()
+    
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts in batches into one float32 matrix.
+        
+        Args:
+            texts (List[str]): Texts to embed
+            
+        Returns:
+            np.ndarray: One embedding per row, in text order
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        workers = min(self.concurrency, len(batches))
+        
+        if workers <= 1:
+            results = map(self._embed_slice, batches)
+        else:
+            # map keeps batch order, so embeddings stay aligned with texts
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._embed_slice, batches))
+        
+        return np.concatenate(list(results))
+    
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a single query.
+        
+        Args:
+            text (str): Query text
+            
+        Returns:
+            List[float]: Embedding vector
+        """
+        return self._embed_slice([text])[0].tolist()
+    
+    def _embed_slice(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed one batch of texts, falling back to per-text requests.
+        
+        Args:
+            texts (List[str]): Texts to embed in a single request
+            
+        Returns:
+            np.ndarray: float32 embeddings, one row per text
+        """
+        response = self._session.post(
+            f"{self.base_url}/api/embed",
+            json={"model": self.model, "input": texts},
+            timeout=EMBED_TIMEOUT
+        )
+        if response.ok:
+            embeddings = json_loads(response.content).get("embeddings")
+            if embeddings and len(embeddings) == len(texts):
+                return np.asarray(embeddings, dtype=np.float32)
+        
+        # Older Ollama releases only have the single-text endpoint
+        return np.asarray([self._embed_one(text) for text in texts], dtype=np.float32)
+    
+    def _embed_one(self, text: str) -> List[float]:
+        """
+        Embed a single text with Ollama's legacy /api/embeddings endpoint.
+        
+        Args:
+            text (str): Text to embed
+            
+        Returns:
+            List[float]: Embedding vector
+        """
+        response = self._session.post(
+            f"{self.base_url}/api/embeddings",
+            json={"model": self.model, "prompt": text},
+            timeout=EMBED_TIMEOUT
+        )
+        response.raise_for_status()
+        return json_loads(response.content)["embedding"]
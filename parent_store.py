@@ -0,0 +1,82 @@
+"""
+Persistent store of parent chunks keyed by parent id.
+"""
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+class ParentStore:
+    """SQLite-backed store of the parent chunks that child chunks expand to."""
+    
+    def __init__(self, path: str):
+        """
+        Initialize the parent store.
+        
+        Args:
+            path (str): Path to the SQLite database file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS parents (
+                parent_id TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                metadata TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+    
+    def get_all(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Read every stored parent chunk.
+        
+        Returns:
+            List[Tuple[str, str, Dict[str, Any]]]: (parent id, text, metadata) rows
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT parent_id, text, metadata FROM parents").fetchall()
+        
+        return [(parent_id, text, json.loads(metadata)) for parent_id, text, metadata in rows]
+    
+    def put_many(self, items: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """
+        Store a batch of parent chunks.
+        
+        Args:
+            items (Iterable[Tuple[str, str, Dict[str, Any]]]): (parent id, text, metadata) rows
+        """
+        rows = [
+            (parent_id, text, json.dumps(metadata, ensure_ascii=False, default=str))
+            for parent_id, text, metadata in items
+        ]
+        
+        if not rows:
+            return
+        
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO parents (parent_id, text, metadata) VALUES (?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+    
+    def clear(self) -> None:
+        """Delete every stored parent chunk."""
+        with self._lock:
+            self._conn.execute("DELETE FROM parents")
+            self._conn.commit()
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,7 +1,8 @@
 """
 RAG (Retrieval Augmented Generation) system core implementation.
 """
-from typing import List, Tuple, Any
+import asyncio
+from typing import Any, Callable, Iterator, List, Optional, Tuple
 from groq_client import GroqClient
 from document_processor import DocumentProcessor
 from vector_store import VectorStoreManager
@@ -45,18 +46,30 @@ class RAGSystem:
                 return False, f"Vector store initialization failed: {vs_message}"
             
             self.is_initialized = True
+            
+            # Keep the tested connection warm for the first real question;
+            # started last so a failed initialization leaves no thread behind
+            self.groq_client.start_keepalive(config.api.keepalive_interval)
             return True, "RAG system initialized successfully!"
             
         except Exception as e:
+            if self.groq_client:
+                self.groq_client.stop_keepalive()
             error_msg = f"RAG system initialization error: {str(e)}"
             return False, error_msg
     
-    def process_documents(self, file_paths: List[str]) -> Tuple[bool, str]:
+    def process_documents(
+        self,
+        file_paths: List[str],
+        progress_cb: Optional[Callable[[int, int], None]] = None
+    ) -> Tuple[bool, str]:
         """
         Process documents and add them to vector store.
         
         Args:
             file_paths (List[str]): List of file paths to process
+            progress_cb (Optional[Callable[[int, int], None]]): Called with
+                (chunks stored, total chunks) while embedding
             
         Returns:
             Tuple[bool, str]: (success, message)
@@ -74,12 +87,21 @@ class RAGSystem:
             if not documents:
                 return False, "No documents were processed"
             
-            # Add to vector store
-            vs_success, vs_message = self.vector_store.add_documents(documents)
+            # Embed small child chunks and keep their parents for context
+            parents = []
+            if config.vectorstore.child_chunk_size:
+                parents = documents
+                documents = self.document_processor.split_children(parents)
+            
+            # Add to vector store, reusing cached embeddings of unchanged chunks
+            hashes = self.document_processor.hash_chunks(documents)
+            vs_success, vs_message = self.vector_store.add_documents(documents, hashes, progress_cb)
             
             if not vs_success:
                 return False, f"Vector store error: {vs_message}"
             
+            self.vector_store.add_parents(parents)
+            
             # Combine messages
             final_message = f"{message}. {vs_message}"
             return True, final_message
@@ -101,26 +123,19 @@ class RAGSystem:
         # Detect language
         detected_language = detect_language(question)
         
-        # Check if documents are available
-        if self.vector_store.get_document_count() == 0:
-            no_docs_msg = self.messages['no_docs_error'][detected_language]
-            return no_docs_msg, []
-        
-        if not self.is_initialized:
-            if detected_language == "hindi":
-                return "सिस्टम तैयार नहीं है!", []
-            else:
-                return "System not initialized!", []
+        not_ready_msg = self._readiness_error(detected_language)
+        if not_ready_msg:
+            return not_ready_msg, []
         
         try:
             # Get relevant documents
-            relevant_docs = self.vector_store.similarity_search(question)
+            relevant_docs = self._retrieve(question)
             
-            # Create context from relevant documents
-            context = self.vector_store.get_context_from_docs(relevant_docs)
+            # Build the prompt with the documents' context in one pass
+            prompt = self.groq_client.build_prompt(question, relevant_docs, detected_language)
             
             # Get answer from Groq
-            answer = self.groq_client.chat(question, context, detected_language)
+            answer = self.groq_client.complete(prompt, detected_language)
             
             return answer, relevant_docs
             
@@ -128,6 +143,150 @@ class RAGSystem:
             error_msg = ErrorHandler.handle_api_error(e, detected_language)
             return error_msg, []
     
+    def query_stream(self, question: str) -> Tuple[Iterator[str], List[Any]]:
+        """
+        Query the RAG system, streaming the answer as it is generated.
+        
+        Args:
+            question (str): User question
+            
+        Returns:
+            Tuple[Iterator[str], List[Any]]: (answer_fragments, source_documents)
+        """
+        # Detect language
+        detected_language = detect_language(question)
+        
+        not_ready_msg = self._readiness_error(detected_language)
+        if not_ready_msg:
+            return iter([not_ready_msg]), []
+        
+        try:
+            # Get relevant documents
+            relevant_docs = self._retrieve(question)
+            
+            # Build the prompt with the documents' context in one pass
+            prompt = self.groq_client.build_prompt(question, relevant_docs, detected_language)
+            
+            # Stream answer from Groq
+            answer_stream = self.groq_client.complete_stream(prompt, detected_language)
+            
+            return answer_stream, relevant_docs
+            
+        except Exception as e:
+            error_msg = ErrorHandler.handle_api_error(e, detected_language)
+            return iter([error_msg]), []
+    
+    def _retrieve(self, question: str) -> List[Any]:
+        """
+        Retrieve context documents for a question.
+        
+        Args:
+            question (str): User question
+            
+        Returns:
+            List[Any]: Matched chunks, expanded to their parent chunks
+        """
+        return self.vector_store.expand_to_parents(self.vector_store.similarity_search(question))
+    
+    def _readiness_error(self, language: str) -> Optional[str]:
+        """
+        Check whether the system can answer questions.
+        
+        Args:
+            language (str): Language for the error message
+            
+        Returns:
+            Optional[str]: Error message, or None if ready
+        """
+        # Check if documents are available
+        if self.vector_store.get_document_count() == 0:
+            return self.messages['no_docs_error'][language]
+        
+        if not self.is_initialized:
+            if language == "hindi":
+                return "सिस्टम तैयार नहीं है!"
+            else:
+                return "System not initialized!"
+        
+        return None
+    
+    async def aquery(self, question: str) -> Tuple[str, List[Any]]:
+        """
+        Query the RAG system without blocking the event loop.
+        
+        Args:
+            question (str): User question
+            
+        Returns:
+            Tuple[str, List[Any]]: (answer, source_documents)
+        """
+        return await asyncio.to_thread(self.query, question)
+    
+    async def abatch_query(self, questions: List[str]) -> List[Tuple[str, List[Any]]]:
+        """
+        Answer several questions concurrently.
+        
+        Retrieval for all questions is done with one batched embedding
+        request and one vector query. The Groq calls are then sent
+        concurrently, limited by the configured concurrency.
+        
+        Args:
+            questions (List[str]): User questions
+            
+        Returns:
+            List[Tuple[str, List[Any]]]: (answer, source_documents) per question, in order
+        """
+        languages = [detect_language(question) for question in questions]
+        results: List[Optional[Tuple[str, List[Any]]]] = [None] * len(questions)
+        
+        pending = []
+        for i, language in enumerate(languages):
+            not_ready_msg = self._readiness_error(language)
+            if not_ready_msg:
+                results[i] = (not_ready_msg, [])
+            else:
+                pending.append(i)
+        
+        if not pending:
+            return results
+        
+        # Get relevant documents for all questions in one pass
+        docs_per_question = await asyncio.to_thread(
+            self.vector_store.similarity_search_batch,
+            [questions[i] for i in pending]
+        )
+        
+        semaphore = asyncio.Semaphore(config.api.max_concurrency)
+        
+        async def answer(i: int, matched_docs: List[Any]) -> None:
+            language = languages[i]
+            try:
+                relevant_docs = self.vector_store.expand_to_parents(matched_docs)
+                prompt = self.groq_client.build_prompt(questions[i], relevant_docs, language)
+                
+                async with semaphore:
+                    response = await asyncio.to_thread(self.groq_client.complete, prompt, language)
+                
+                results[i] = (response, relevant_docs)
+                
+            except Exception as e:
+                results[i] = (ErrorHandler.handle_api_error(e, language), [])
+        
+        await asyncio.gather(*(answer(i, docs) for i, docs in zip(pending, docs_per_question)))
+        return results
+    
+    def batch_query(self, questions: List[str]) -> List[Tuple[str, List[Any]]]:
+        """
+        Answer several questions concurrently from synchronous code.
+        
+        Args:
+            questions (List[str]): User questions
+            
+        Returns:
+            List[Tuple[str, List[Any]]]: (answer, source_documents) per question, in order
+        """
+        return asyncio.run(self.abatch_query(questions))
+    
     def clear_documents(self) -> Tuple[bool, str]:
         """
         Clear all documents from the system.
@@ -142,6 +301,13 @@ class RAGSystem:
         except Exception as e:
             return False, f"Error clearing documents: {str(e)}"
     
+    def close(self) -> None:
+        """Release the Groq client and vector store resources."""
+        self.is_initialized = False
+        if self.groq_client:
+            self.groq_client.close()
+        self.vector_store.close()
+    
     def get_system_status(self) -> dict:
         """
         Get comprehensive system status.
@@ -170,7 +336,9 @@ class RAGSystem:
         Returns:
             dict: Document statistics
         """
-        return self.document_processor.get_document_stats(self.vector_store.documents)
+        return self.document_processor.get_document_stats(
+            chunk_lengths=self.vector_store.chunk_lengths
+        )
     
     def validate_file(self, filename: str) -> bool:
         """
@@ -184,6 +352,19 @@ class RAGSystem:
         """
         return self.document_processor.validate_file_format(filename)
     
+    def validate_files(self, filenames: List[str]) -> List[bool]:
+        """
+        Validate several files in one call.
+        
+        Args:
+            filenames (List[str]): File names to validate
+            
+        Returns:
+            List[bool]: Whether each file is supported, in input order
+        """
+        validate = self.document_processor.validate_file_format
+        return [validate(filename) for filename in filenames]
+    
     def get_troubleshooting_info(self) -> dict:
         """
         Get troubleshooting information for common issues.
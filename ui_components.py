@@ -2,9 +2,28 @@
 Streamlit UI components for the RAG chatbot application.
 """
 import streamlit as st
-from typing import List, Dict, Any
-from utils import detect_language, format_file_size, save_uploaded_files, cleanup_temp_files
-from config import config
+from typing import List, Dict, Any, Optional
+
+# Application modules are imported inside the methods that use them, so
+# the first render does not pull in their dependencies
+
+# Language-specific UI strings, built once instead of on every render
+LANG_STR = {
+    "hindi": {
+        "thinking": "सोच रहा हूँ...",
+        "sources_header": "📚 स्रोत | Sources",
+        "source_label": "**स्रोत | Source {}:**",
+        "detected_caption": "🇮🇳 पहचानी गई भाषा | Detected: हिंदी",
+        "no_docs_error": "❌ कृपया पहले दस्तावेज़ अपलोड करके प्रोसेस करें!"
+    },
+    "english": {
+        "thinking": "Thinking...",
+        "sources_header": "📚 Sources",
+        "source_label": "**Source {}:**",
+        "detected_caption": "🇺🇸 पहचानी गई भाषा | Detected: English",
+        "no_docs_error": "❌ Please upload and process documents first!"
+    }
+}
 
 
 class UIComponents:
@@ -19,7 +38,8 @@ class UIComponents:
         """
         self.rag_system = rag_system
     
-    def render_header(self):
+    @staticmethod
+    def render_header():
         """Render application header."""
         st.set_page_config(
             page_title="Language-Smart RAG Chatbot",
@@ -30,8 +50,11 @@ class UIComponents:
         st.title("🤖 भाषा-स्मार्ट RAG चैटबॉट | Language-Smart RAG Chatbot")
         st.markdown("**हिंदी और अंग्रेजी में अपने दस्तावेज़ों से चैट करें | Chat with your documents in Hindi and English**")
     
-    def render_language_demo(self):
+    @staticmethod
+    def render_language_demo():
         """Render language detection demo."""
+        from utils import detect_language
+        
         with st.expander("🔍 भाषा पहचान डेमो | Language Detection Demo"):
             test_text = st.text_input(
                 "टेस्ट टेक्स्ट डालें | Enter test text:", 
@@ -54,6 +77,8 @@ class UIComponents:
     
     def _render_document_upload(self):
         """Render document upload section."""
+        from utils import format_file_size
+        
         st.header("📁 दस्तावेज़ अपलोड | Upload Documents")
         
         uploaded_files = st.file_uploader(
@@ -63,13 +88,13 @@ class UIComponents:
         )
         
         if uploaded_files:
-            # Show file information
-            st.write("**Selected Files:**")
-            for file in uploaded_files:
-                file_size = format_file_size(file.size)
-                is_valid = self.rag_system.validate_file(file.name)
-                status_icon = "✅" if is_valid else "❌"
-                st.write(f"{status_icon} {file.name} ({file_size})")
+            # Show file information in a single markdown block
+            valid = self.rag_system.validate_files([file.name for file in uploaded_files])
+            lines = [
+                f"{'✅' if is_valid else '❌'} {file.name} ({format_file_size(file.size)})"
+                for file, is_valid in zip(uploaded_files, valid)
+            ]
+            st.markdown("**Selected Files:**\n\n" + "\n\n".join(lines))
         
         if st.button("📤 दस्तावेज़ प्रोसेस करें | Process Documents", type="primary"):
             if uploaded_files:
@@ -79,13 +104,20 @@ class UIComponents:
     
     def _process_uploaded_files(self, uploaded_files):
         """Process uploaded files."""
+        from utils import save_uploaded_files, cleanup_temp_files
+        
         with st.spinner("Processing documents..."):
             # Save uploaded files
             temp_files = save_uploaded_files(uploaded_files)
             
             try:
-                # Process documents
-                success, message = self.rag_system.process_documents(temp_files)
+                # Process documents, reporting embedding progress
+                progress = st.progress(0.0, text="Embedding chunks...")
+                success, message = self.rag_system.process_documents(
+                    temp_files,
+                    lambda done, total: progress.progress(done / total, text=f"Embedded {done}/{total} chunks")
+                )
+                progress.empty()
                 
                 if success:
                     st.success(f"✅ {message}")
@@ -103,6 +135,8 @@ class UIComponents:
     
     def _render_system_info(self):
         """Render system information."""
+        from config import config
+        
         st.header("ℹ️ सिस्टम जानकारी | System Info")
         
         # Get system status
@@ -154,10 +188,21 @@ class UIComponents:
         if "messages" not in st.session_state:
             st.session_state.messages = []
         
-        # Display chat messages
-        self._render_chat_messages()
+        # Full page runs draw the whole history once; asking a question
+        # reruns only the chat fragment, which draws the turns added since
+        # below the history already on screen
+        self._render_chat_messages(st.session_state.messages)
+        st.session_state.history_rendered = len(st.session_state.messages)
+        self._render_chat()
+    
+    @st.fragment
+    def _render_chat(self):
+        """Render recent chat turns and the chat input as an isolated fragment."""
+        # Display turns added since the last full page run
+        self._render_chat_messages(st.session_state.messages[st.session_state.history_rendered:])
         
-        # Chat input
+        # Chat input; inside a fragment it renders inline instead of pinned
+        # to the bottom, so main() draws the chat last
         self._render_chat_input()
     
     def _render_examples(self):
@@ -169,46 +214,63 @@ class UIComponents:
         - Mixed: "Machine Learning क्या है और इसके फायदे बताइए"
         """)
     
-    def _render_chat_messages(self):
-        """Render chat message history."""
-        for message in st.session_state.messages:
+    def _render_chat_messages(self, messages: List[Dict[str, Any]]):
+        """Render chat messages."""
+        for message in messages:
             with st.chat_message(message["role"]):
                 st.markdown(message["content"])
                 
                 # Show detected language for user messages
                 if message["role"] == "user" and "detected_language" in message:
-                    lang_emoji = "🇮🇳" if message["detected_language"] == "hindi" else "🇺🇸"
-                    lang_name = "हिंदी" if message["detected_language"] == "hindi" else "English"
-                    st.caption(f"{lang_emoji} पहचानी गई भाषा | Detected: {lang_name}")
+                    st.caption(LANG_STR[message["detected_language"]]["detected_caption"])
                 
                 # Show sources for assistant messages
                 if message["role"] == "assistant" and "sources" in message:
-                    self._render_sources(message["sources"], message.get("detected_language", "english"))
+                    self._render_sources(
+                        message["sources"],
+                        message.get("detected_language", "english"),
+                        message.get("sources_md")
+                    )
+    
+    @staticmethod
+    def _format_sources_md(sources: List[str], language: str = "english") -> str:
+        """
+        Join source documents into a single markdown string.
+        
+        Args:
+            sources: Truncated source texts
+            language: Language used for the source labels
+            
+        Returns:
+            str: Markdown for all sources
+        """
+        source_label = LANG_STR[language]["source_label"]
+        return "\n".join(
+            f"{source_label.format(i)}\n```\n{source}\n```"
+            for i, source in enumerate(sources, 1)
+        )
     
-    def _render_sources(self, sources: List[str], language: str = "english"):
+    def _render_sources(self, sources: List[str], language: str = "english",
+                        sources_md: Optional[str] = None):
         """Render source documents."""
-        sources_header = "📚 स्रोत | Sources" if language == "hindi" else "📚 Sources"
+        if sources_md is None:
+            sources_md = self._format_sources_md(sources, language)
         
-        with st.expander(sources_header):
-            for i, source in enumerate(sources, 1):
-                source_label = f"**स्रोत | Source {i}:**" if language == "hindi" else f"**Source {i}:**"
-                st.markdown(source_label)
-                st.markdown(f"```\n{source}\n```")
+        with st.expander(LANG_STR[language]["sources_header"]):
+            st.markdown(sources_md)
     
     def _render_chat_input(self):
         """Render chat input and handle user queries."""
+        from utils import detect_language
+        
         if prompt := st.chat_input("अपने दस्तावेज़ों के बारे में पूछें... | Ask about your documents..."):
-            # Check if documents are loaded
-            if self.rag_system.vector_store.get_document_count() == 0:
-                detected_lang = detect_language(prompt)
-                if detected_lang == "hindi":
-                    st.error("❌ कृपया पहले दस्तावेज़ अपलोड करके प्रोसेस करें!")
-                else:
-                    st.error("❌ Please upload and process documents first!")
-                return
-            
             # Detect language
             detected_language = detect_language(prompt)
+            strings = LANG_STR[detected_language]
+            
+            if self.rag_system.vector_store.get_document_count() == 0:
+                st.error(strings["no_docs_error"])
+                return
             
             # Add user message
             user_message = {
@@ -221,35 +283,34 @@ class UIComponents:
             # Display user message
             with st.chat_message("user"):
                 st.markdown(prompt)
-                lang_emoji = "🇮🇳" if detected_language == "hindi" else "🇺🇸"
-                lang_name = "हिंदी" if detected_language == "hindi" else "English"
-                st.caption(f"{lang_emoji} पहचानी गई भाषा | Detected: {lang_name}")
+                st.caption(strings["detected_caption"])
             
             # Get AI response
             with st.chat_message("assistant"):
-                thinking_text = "सोच रहा हूँ..." if detected_language == "hindi" else "Thinking..."
+                with st.spinner(strings["thinking"]):
+                    answer_stream, sources = self.rag_system.query_stream(prompt)
                 
-                with st.spinner(thinking_text):
-                    answer, sources = self.rag_system.query(prompt)
-                    
-                    st.markdown(answer)
-                    
-                    # Prepare and display sources
-                    source_texts = []
-                    if sources:
-                        source_texts = [doc.page_content[:300] + "..." for doc in sources]
-                        self._render_sources(source_texts, detected_language)
-                    
-                    # Add assistant message to history
-                    assistant_message = {
-                        "role": "assistant",
-                        "content": answer,
-                        "detected_language": detected_language
-                    }
-                    if source_texts:
-                        assistant_message["sources"] = source_texts
-                    
-                    st.session_state.messages.append(assistant_message)
+                # Render tokens as they arrive
+                answer = st.write_stream(answer_stream)
+                
+                # Prepare and display sources
+                source_texts = []
+                if sources:
+                    source_texts = [doc.page_content[:300] + "..." for doc in sources]
+                    sources_md = self._format_sources_md(source_texts, detected_language)
+                    self._render_sources(source_texts, detected_language, sources_md)
+                
+                # Add assistant message to history
+                assistant_message = {
+                    "role": "assistant",
+                    "content": answer,
+                    "detected_language": detected_language
+                }
+                if source_texts:
+                    assistant_message["sources"] = source_texts
+                    assistant_message["sources_md"] = sources_md
+                
+                st.session_state.messages.append(assistant_message)
     
     def render_troubleshooting(self):
         """Render troubleshooting information."""
@@ -1,29 +1,101 @@
 """
 Utility functions for the RAG Chatbot application.
 """
+import logging
 import os
+import shutil
 import tempfile
 import warnings
-from typing import List, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from functools import lru_cache
+from typing import List, Optional, Tuple, Any
+
+import numpy as np
+
 from config import config
 
 # Suppress warnings
 warnings.filterwarnings("ignore")
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _alpha_lut() -> np.ndarray:
+    """
+    Build a lookup table of alphabetic Basic Multilingual Plane codepoints.
+    
+    Returns:
+        np.ndarray: Boolean table indexed by codepoint (0x0000-0xFFFF)
+    """
+    return np.fromiter((chr(i).isalpha() for i in range(0x10000)), dtype=bool, count=0x10000)
+
+
+# Texts up to this length are memoized by detect_language; longer ones
+# are rare and would make the cache hold large strings
+LANGUAGE_CACHE_MAX_TEXT_LENGTH = 512
+
 
 def detect_language(text: str) -> str:
     """
     Simple language detection for Hindi and English.
     
+    Results for short texts such as chat prompts are cached, since Streamlit
+    reruns detect the same prompt repeatedly.
+    
     Args:
         text (str): Input text to analyze
         
     Returns:
         str: 'hindi' or 'english'
     """
-    # Count Hindi characters (Devanagari script)
-    hindi_chars = sum(1 for char in text if '\u0900' <= char <= '\u097F')
-    total_chars = len([char for char in text if char.isalpha()])
+    if len(text) <= LANGUAGE_CACHE_MAX_TEXT_LENGTH:
+        return _detect_language_cached(text)
+    return _detect_language(text)
+
+
+# Index of the Devanagari block (U+0900-U+097F) in 128-codepoint units
+DEVANAGARI_BLOCK = 0x0900 >> 7
+
+
+def _count_chars(codepoints: np.ndarray) -> Tuple[int, int, int]:
+    """
+    Count Devanagari and alphabetic characters with vectorized scans.
+    
+    Args:
+        codepoints (np.ndarray): Text as uint32 codepoints
+        
+    Returns:
+        Tuple[int, int, int]: Devanagari count, alphabetic BMP count and
+        number of supplementary-plane codepoints
+    """
+    # U+0900-U+097F is exactly one 128-codepoint block, so a single shift
+    # and compare selects it
+    hindi_chars = int(np.count_nonzero((codepoints >> 7) == DEVANAGARI_BLOCK))
+    
+    bmp = codepoints <= 0xFFFF
+    total_chars = int(np.count_nonzero(_alpha_lut()[codepoints[bmp]]))
+    return hindi_chars, total_chars, codepoints.size - int(np.count_nonzero(bmp))
+
+
+def _detect_language(text: str) -> str:
+    """
+    Detect Hindi or English from the share of Devanagari characters.
+    
+    Args:
+        text (str): Input text to analyze
+        
+    Returns:
+        str: 'hindi' or 'english'
+    """
+    codepoints = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    
+    hindi_chars, total_chars, supplementary = _count_chars(codepoints)
+    
+    # Supplementary-plane characters are rare, check them individually
+    if supplementary:
+        total_chars += sum(chr(c).isalpha() for c in codepoints[codepoints > 0xFFFF].tolist())
     
     if total_chars == 0:
         return "english"  # Default to English if no alphabetic characters
@@ -37,6 +109,16 @@ def detect_language(text: str) -> str:
         return "english"
 
 
+_detect_language_cached = lru_cache(maxsize=2048)(_detect_language)
+
+
+# Block size for streaming uploads to disk
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Maximum number of uploads written to disk concurrently
+MAX_SAVE_WORKERS = 8
+
+
 def save_uploaded_files(uploaded_files) -> List[str]:
     """
     Save uploaded files to temporary location.
@@ -47,26 +129,44 @@ def save_uploaded_files(uploaded_files) -> List[str]:
     Returns:
         List[str]: List of temporary file paths
     """
-    temp_files = []
+    if not uploaded_files:
+        return []
     
-    for file in uploaded_files:
-        try:
-            # Get file extension
-            file_extension = file.name.split('.')[-1].lower()
-            
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(
-                delete=False, 
-                suffix=f".{file_extension}"
-            ) as tmp:
-                tmp.write(file.getvalue())
-                temp_files.append(tmp.name)
-                
-        except Exception as e:
-            print(f"Error saving file {file.name}: {str(e)}")
-            continue
+    # Writes are pure I/O, so overlap them on a small thread pool
+    max_workers = min(MAX_SAVE_WORKERS, len(uploaded_files))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        saved = list(pool.map(_save_uploaded_file, uploaded_files))
     
-    return temp_files
+    return [path for path in saved if path]
+
+
+def _save_uploaded_file(file) -> Optional[str]:
+    """
+    Save a single uploaded file to a temporary location.
+    
+    Args:
+        file: Streamlit uploaded file
+        
+    Returns:
+        Optional[str]: Temporary file path, or None if saving failed
+    """
+    try:
+        # Get file extension
+        file_extension = file.name.split('.')[-1].lower()
+        
+        # Create temporary file
+        with tempfile.NamedTemporaryFile(
+            delete=False, 
+            suffix=f".{file_extension}"
+        ) as tmp:
+            # Stream in 1 MB blocks rather than copying the whole upload
+            file.seek(0)
+            shutil.copyfileobj(file, tmp, length=COPY_BUFFER_SIZE)
+            return tmp.name
+            
+    except Exception as e:
+        logger.error("Error saving file %s: %s", file.name, e)
+        return None
 
 
 def cleanup_temp_files(temp_files: List[str]) -> None:
@@ -78,25 +178,14 @@ def cleanup_temp_files(temp_files: List[str]) -> None:
     """
     for tmp_file in temp_files:
         try:
-            if os.path.exists(tmp_file):
+            # Already-deleted files are fine; unlinking directly saves a stat
+            with suppress(FileNotFoundError):
                 os.unlink(tmp_file)
         except Exception as e:
-            print(f"Warning: Could not delete temporary file {tmp_file}: {str(e)}")
+            logger.warning("Could not delete temporary file %s: %s", tmp_file, e)
 
 
-def validate_file_type(filename: str) -> bool:
-    """
-    Validate if file type is supported.
-    
-    Args:
-        filename (str): Name of the file
-        
-    Returns:
-        bool: True if file type is supported
-    """
-    supported_extensions = ['.pdf', '.txt']
-    file_extension = '.' + filename.split('.')[-1].lower()
-    return file_extension in supported_extensions
+FILE_SIZE_UNITS = ("B", "KB", "MB", "GB")
 
 
 def format_file_size(size_bytes: int) -> str:
@@ -109,17 +198,14 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         str: Formatted size string
     """
-    if size_bytes == 0:
+    if size_bytes <= 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB"]
-    i = 0
+    # Each unit is 2**10 times the previous one, so the unit index is the
+    # number of whole 10-bit groups in the size
+    i = min((int(size_bytes).bit_length() - 1) // 10, len(FILE_SIZE_UNITS) - 1)
     
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
-    
-    return f"{size_bytes:.1f} {size_names[i]}"
+    return f"{size_bytes / (1 << (10 * i)):.1f} {FILE_SIZE_UNITS[i]}"
 
 
 def get_language_messages() -> dict:
@@ -179,6 +265,31 @@ def get_system_prompts() -> dict:
     }
 
 
+def get_prompt_templates() -> dict:
+    """
+    Get prompt building blocks for different languages.
+    
+    Returns:
+        dict: Language -> (prefix, context_label, question_label, answer_suffix)
+    """
+    system_prompts = get_system_prompts()
+    
+    return {
+        'hindi': (
+            f"{system_prompts['hindi']}\n\n",
+            "संदर्भ (Context): ",
+            "प्रश्न: ",
+            "\n\nउत्तर (केवल हिंदी में):"
+        ),
+        'english': (
+            f"{system_prompts['english']}\n\n",
+            "Context: ",
+            "Question: ",
+            "\n\nAnswer (in English only):"
+        )
+    }
+
+
 class ErrorHandler:
     """Custom error handler for the application."""
     
@@ -0,0 +1,463 @@
+"""
+In-memory vector indexes scored with NumPy, in front of Chroma.
+"""
+import os
+from contextlib import suppress
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Rows scored per block, bounding the float32 copy made while scanning
+# compact storage
+SCORE_BLOCK_ROWS = 4096
+
+# Rows kept by the binary Hamming prefilter per requested result; sign
+# bits alone rank coarsely, so keep a wide pool for int8 scoring
+PREFILTER_FACTOR = 10
+
+# Set bits per byte value, for NumPy releases without np.bitwise_count
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    """
+    Count set bits along the last axis of a uint8 array.
+    
+    Args:
+        bits (np.ndarray): Packed bits
+        
+    Returns:
+        np.ndarray: Set bit count per row
+    """
+    if hasattr(np, 'bitwise_count'):
+        counts = np.bitwise_count(bits)
+    else:
+        counts = _POPCOUNT[bits]
+    return counts.sum(axis=-1, dtype=np.int32)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    Scale vectors to unit L2 norm, so a dot product gives their cosine.
+    
+    Args:
+        vectors (np.ndarray): Float vectors, one per row
+        
+    Returns:
+        np.ndarray: Unit-norm float32 rows (all-zero rows stay zero)
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, np.finfo(np.float32).tiny)
+
+
+def top_rows(scores: np.ndarray, n: int) -> np.ndarray:
+    """
+    Find the n highest scores without sorting every score.
+    
+    Args:
+        scores (np.ndarray): Score per row
+        n (int): Number of rows to return
+        
+    Returns:
+        np.ndarray: Row indices, highest score first
+    """
+    n = min(n, len(scores))
+    if n <= 0:
+        return np.zeros(0, dtype=np.intp)
+    top = np.argpartition(-scores, n - 1)[:n]
+    return top[np.argsort(-scores[top])]
+
+
+def blocked_dot(matrix: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """
+    Multiply a compactly stored matrix by a float32 vector or matrix.
+    
+    NumPy has no float16 or int8 GEMV with a float32 accumulator, so rows
+    are upcast one block at a time and each block goes through BLAS.
+    
+    Args:
+        matrix (np.ndarray): Rows in any numeric dtype
+        q (np.ndarray): float32 vector, or one query per column
+        
+    Returns:
+        np.ndarray: float32 dot products, one row per matrix row
+    """
+    if matrix.dtype == np.float32:
+        return matrix @ q
+    
+    scores = np.empty((len(matrix),) + q.shape[1:], dtype=np.float32)
+    for start in range(0, len(matrix), SCORE_BLOCK_ROWS):
+        block = matrix[start:start + SCORE_BLOCK_ROWS]
+        scores[start:start + len(block)] = block.astype(np.float32) @ q
+    return scores
+
+
+def append_rows(array: np.ndarray, rows: np.ndarray, size: int) -> np.ndarray:
+    """
+    Write rows after the first size rows of a preallocated array.
+    
+    Capacity grows to the next power of two when full, so appending n rows
+    one batch at a time copies O(n) data in total rather than O(n^2).
+    
+    Args:
+        array (np.ndarray): Storage whose first size rows are in use
+        rows (np.ndarray): Rows to append
+        size (int): Number of rows in use
+        
+    Returns:
+        np.ndarray: The storage, reallocated if it had to grow
+    """
+    needed = size + len(rows)
+    if array.shape[1:] != rows.shape[1:]:
+        # Row width is unknown until the first rows arrive
+        array = np.empty((0,) + rows.shape[1:], dtype=array.dtype)
+    if needed > len(array):
+        grown = np.empty((1 << (needed - 1).bit_length(),) + rows.shape[1:], dtype=array.dtype)
+        grown[:size] = array[:size]
+        array = grown
+    array[size:needed] = rows
+    return array
+
+
+def top_rows_many(scores: np.ndarray, n: int) -> np.ndarray:
+    """
+    Find the n highest scores in each row of a score matrix.
+    
+    Args:
+        scores (np.ndarray): Scores, one row per query
+        n (int): Number of columns to return per query
+        
+    Returns:
+        np.ndarray: Column indices per query, highest score first
+    """
+    n = min(n, scores.shape[1])
+    if n <= 0:
+        return np.zeros((len(scores), 0), dtype=np.intp)
+    top = np.argpartition(-scores, n - 1, axis=1)[:, :n]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def quantize_i8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize unit-norm vectors to int8 with a per-vector absmax scale.
+    
+    Args:
+        vectors (np.ndarray): Unit-norm float vectors, one per row
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (int8 codes, float32 scale per row),
+        where codes * scale approximates the vector
+    """
+    unit = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    
+    scales = np.abs(unit).max(axis=1) / 127
+    scales[scales == 0] = 1
+    codes = np.rint(unit / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class DenseIndex:
+    """
+    Normalized float vectors, scored with one matrix-vector product.
+    
+    Stored as float16 they take half the memory of float32, and cosine
+    scores stay within about 1e-3 of the float32 ones. Scans are slower,
+    though, since NumPy upcasts float16 in software before the BLAS call.
+    
+    Given a path, the matrix lives in a memory-mapped .npy file, so a
+    restart maps it from the page cache instead of decoding every vector.
+    """
+    
+    # Scores are (near) exact cosines, so results need no rerank
+    approximate = False
+    
+    def __init__(self, dtype: type = np.float32, path: Optional[str] = None):
+        """
+        Initialize an empty index.
+        
+        Args:
+            dtype (type): Storage dtype, np.float32 or np.float16
+            path (Optional[str]): File backing the matrix, None to keep it in memory
+        """
+        self.dtype = dtype
+        self.path = path
+        self.ids: List[str] = []
+        self._matrix = np.zeros((0, 0), dtype=dtype)
+    
+    def __len__(self) -> int:
+        """Number of indexed vectors."""
+        return len(self.ids)
+    
+    def add(self, ids: List[str], embeddings: List[List[float]]) -> None:
+        """
+        Append vectors.
+        
+        Args:
+            ids (List[str]): Chroma id of each vector
+            embeddings (np.ndarray): Unit-norm float vectors in id order
+        """
+        unit = np.atleast_2d(np.asarray(embeddings, dtype=self.dtype))
+        size = len(self.ids)
+        if self.path is None:
+            self._matrix = append_rows(self._matrix, unit, size)
+        else:
+            needed = size + len(unit)
+            if needed > len(self._matrix) or self._matrix.shape[1:] != unit.shape[1:]:
+                self._grow_file(needed, unit.shape[1])
+            self._matrix[size:needed] = unit
+            self._matrix.flush()
+        self.ids.extend(ids)
+    
+    def _grow_file(self, rows: int, dim: int) -> None:
+        """
+        Move the matrix to a larger file, doubling capacity like append_rows.
+        
+        Args:
+            rows (int): Rows the file must hold
+            dim (int): Vector length
+        """
+        size = len(self.ids)
+        tmp_path = self.path + ".tmp"
+        grown = np.lib.format.open_memmap(
+            tmp_path, mode='w+', dtype=self.dtype, shape=(1 << (rows - 1).bit_length(), dim)
+        )
+        if size:
+            grown[:size] = self._matrix[:size]
+        grown.flush()
+        
+        # Drop both mappings before the file is replaced
+        del grown
+        self._matrix = np.zeros((0, 0), dtype=self.dtype)
+        os.replace(tmp_path, self.path)
+        self._matrix = np.load(self.path, mmap_mode='r+')
+    
+    def load(self, ids: List[str]) -> bool:
+        """
+        Map the saved matrix for vectors already stored in Chroma.
+        
+        Args:
+            ids (List[str]): Chroma ids of the saved rows, in row order
+            
+        Returns:
+            bool: True if the file exists and can hold those rows
+        """
+        if self.path is None or not os.path.exists(self.path):
+            return False
+        
+        matrix = np.load(self.path, mmap_mode='r+')
+        if matrix.dtype != self.dtype or matrix.ndim != 2 or len(matrix) < len(ids):
+            return False
+        
+        self._matrix = matrix
+        self.ids = list(ids)
+        return True
+    
+    def vector(self, row: int) -> np.ndarray:
+        """
+        Get the stored (normalized) vector of a row.
+        
+        Args:
+            row (int): Row index
+            
+        Returns:
+            np.ndarray: float32 vector
+        """
+        return np.asarray(self._matrix[row], dtype=np.float32)
+    
+    def search(self, query: List[float], n: int) -> List[int]:
+        """
+        Find the rows most similar to a query by cosine.
+        
+        Args:
+            query (np.ndarray): Unit-norm query embedding
+            n (int): Number of rows to return
+            
+        Returns:
+            List[int]: Row indices, most similar first
+        """
+        if not self.ids or n <= 0:
+            return []
+        
+        scores = blocked_dot(self._matrix[:len(self.ids)], np.asarray(query, dtype=np.float32))
+        return top_rows(scores, n).tolist()
+    
+    def search_many(self, queries: List[List[float]], n: int) -> List[List[int]]:
+        """
+        Find the most similar rows for several queries at once.
+        
+        Args:
+            queries (np.ndarray): Unit-norm query embeddings, one per row
+            n (int): Number of rows to return per query
+            
+        Returns:
+            List[List[int]]: Row indices per query, most similar first
+        """
+        if not self.ids or n <= 0:
+            return [[] for _ in queries]
+        
+        # One GEMM scores every query, reusing each loaded block of rows
+        # across all of them instead of streaming the matrix once per query
+        scores = blocked_dot(self._matrix[:len(self.ids)], np.asarray(queries, dtype=np.float32).T)
+        return top_rows_many(scores.T, n).tolist()
+    
+    def clear(self) -> None:
+        """Remove all vectors, deleting the backing file if there is one."""
+        self._matrix = np.zeros((0, 0), dtype=self.dtype)
+        if self.path is not None:
+            with suppress(FileNotFoundError):
+                os.remove(self.path)
+        self.__init__(self.dtype, self.path)
+
+
+class Int8Index:
+    """
+    Int8 scalar-quantized vectors, a quarter the size of float32 ones.
+    
+    A sign-bit copy of each vector (1 bit per dimension) is kept as well,
+    so large indexes are narrowed with a Hamming scan before int8 scoring.
+    """
+    
+    # Scores are approximate, so callers should rerank the results
+    approximate = True
+    
+    def __init__(self):
+        """Initialize an empty index."""
+        self.ids: List[str] = []
+        self._codes = np.zeros((0, 0), dtype=np.int8)
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._bits = np.zeros((0, 0), dtype=np.uint8)
+    
+    def __len__(self) -> int:
+        """Number of indexed vectors."""
+        return len(self.ids)
+    
+    def add(self, ids: List[str], embeddings: List[List[float]]) -> None:
+        """
+        Quantize and append vectors.
+        
+        Args:
+            ids (List[str]): Chroma id of each vector
+            embeddings (np.ndarray): Unit-norm float vectors in id order
+        """
+        codes, scales = quantize_i8(embeddings)
+        size = len(self.ids)
+        self._codes = append_rows(self._codes, codes, size)
+        self._scales = append_rows(self._scales, scales, size)
+        self._bits = append_rows(self._bits, np.packbits(codes > 0, axis=1), size)
+        self.ids.extend(ids)
+    
+    def search(self, query: List[float], n: int) -> List[int]:
+        """
+        Find the rows most similar to a query by approximate cosine.
+        
+        Args:
+            query (np.ndarray): Unit-norm query embedding
+            n (int): Number of rows to return
+            
+        Returns:
+            List[int]: Row indices, most similar first
+        """
+        if not self.ids or n <= 0:
+            return []
+        
+        codes, scale = quantize_i8(query)
+        q = codes[0].astype(np.float32) * scale[0]
+        
+        # Narrow large indexes to the rows whose sign bits differ least
+        # from the query's, moving 1/8 of the int8 bytes
+        size = len(self.ids)
+        pool = n * PREFILTER_FACTOR
+        if size > pool:
+            distances = popcount(self._bits[:size] ^ np.packbits(codes[0] > 0))
+            rows = np.argpartition(distances, pool - 1)[:pool]
+            scores = (self._codes[rows].astype(np.float32) @ q) * self._scales[rows]
+        else:
+            rows = np.arange(size)
+            scores = self._score_all(q)
+        
+        return rows[top_rows(scores, n)].tolist()
+    
+    def search_many(self, queries: List[List[float]], n: int) -> List[List[int]]:
+        """
+        Find the most similar rows for several queries.
+        
+        Each query gets its own Hamming prefilter, so they are searched one
+        at a time.
+        
+        Args:
+            queries (np.ndarray): Unit-norm query embeddings, one per row
+            n (int): Number of rows to return per query
+            
+        Returns:
+            List[List[int]]: Row indices per query, most similar first
+        """
+        return [self.search(query, n) for query in queries]
+    
+    def load(self, ids: List[str]) -> bool:
+        """
+        Int8 codes are not saved, so the caller re-adds the vectors.
+        
+        Args:
+            ids (List[str]): Chroma ids of the stored vectors
+            
+        Returns:
+            bool: Always False
+        """
+        return False
+    
+    def vector(self, row: int) -> np.ndarray:
+        """
+        Get the dequantized (normalized) vector of a row.
+        
+        Args:
+            row (int): Row index
+            
+        Returns:
+            np.ndarray: float32 vector
+        """
+        return self._codes[row].astype(np.float32) * self._scales[row]
+    
+    def _score_all(self, q: np.ndarray) -> np.ndarray:
+        """
+        Score every row against a dequantized query.
+        
+        Args:
+            q (np.ndarray): Query vector
+            
+        Returns:
+            np.ndarray: Approximate cosine similarity per row
+        """
+        size = len(self.ids)
+        return blocked_dot(self._codes[:size], q) * self._scales[:size]
+    
+    def clear(self) -> None:
+        """Remove all vectors."""
+        self.__init__()
+
+
+# Storage dtype for each dense INDEX_PRECISION setting
+DENSE_DTYPES = {
+    "float32": np.float32,
+    "float16": np.float16
+}
+
+
+def create_index(precision: str, path: Optional[str] = None):
+    """
+    Create an empty index storing vectors at the given precision.
+    
+    Args:
+        precision (str): "float32", "float16" or "int8"
+        path (Optional[str]): File backing a dense index's matrix
+        
+    Returns:
+        An empty DenseIndex or Int8Index
+    """
+    if precision == "int8":
+        return Int8Index()
+    try:
+        return DenseIndex(DENSE_DTYPES[precision], path)
+    except KeyError:
+        raise ValueError(f"Unsupported index precision: {precision}") from None
@@ -1,16 +1,69 @@
 """
 Vector store management for document embeddings and similarity search.
 """
-from typing import List, Any, Tuple, Optional
+import atexit
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
 from config import config
+from embedding_cache import EmbeddingCache
+from parent_store import ParentStore
 from utils import ErrorHandler
+from vector_index import append_rows, create_index, normalize_rows, top_rows
+
+# LangChain's Chroma wrapper, Document and the embeddings client are
+# imported on first use: they are slow to import and not needed until the
+# vector store is initialized.
+
+logger = logging.getLogger(__name__)
+
+# Seconds before an identical error is logged again, so a flood of failing
+# queries (say, while Ollama restarts) doesn't flood the log
+ERROR_LOG_INTERVAL = 60
+
+# Last time each distinct error was logged
+_error_log_times: Dict[str, float] = {}
+
+
+def _log_error(message: str, error: Exception) -> None:
+    """
+    Log an error with its traceback, at most once per ERROR_LOG_INTERVAL.
+    
+    Args:
+        message (str): What failed
+        error (Exception): The exception raised
+    """
+    key = f"{message}: {error}"
+    now = time.monotonic()
+    if now - _error_log_times.get(key, float('-inf')) < ERROR_LOG_INTERVAL:
+        return
+    if len(_error_log_times) > 1024:
+        _error_log_times.clear()
+    _error_log_times[key] = now
+    logger.error("%s: %s", message, error, exc_info=error)
+
+
+# Ids per Chroma delete call, below SQLite's bound-parameter limits
+DELETE_BATCH_SIZE = 5000
 
-# Import with error handling
-try:
-    from langchain_community.vectorstores import Chroma
-    from langchain_community.embeddings import OllamaEmbeddings
-except ImportError as e:
-    raise ImportError(f"Required packages not installed: {e}")
+# Seconds an embeddings test result is trusted by health_check
+HEALTH_CHECK_TTL = 30
+
+# Recent search results kept for repeated queries
+QUERY_CACHE_SIZE = 1024
+
+# File in the Chroma directory holding the next chunk id
+ID_COUNTER_FILE = "next_id.json"
+
+# Database in the Chroma directory holding parent chunks
+PARENT_STORE_FILE = "parents.sqlite3"
 
 
 class VectorStoreManager:
@@ -20,8 +73,141 @@ class VectorStoreManager:
         """Initialize vector store manager."""
         self.embeddings = None
         self.vectorstore = None
-        self.documents = []
+        self.embedding_cache = None
+        self.parent_store = None
+        self.parents: Dict[str, Any] = {}
+        self._next_id = 0
+        self._reset_rows()
+        self.index = create_index(
+            config.vectorstore.index_precision,
+            os.path.join(config.vectorstore.chroma_dir, f"index_{config.vectorstore.index_precision}.npy")
+        )
         self.is_initialized = False
+        
+        # LRU of (stripped query, k) -> results, emptied whenever the
+        # stored documents change
+        self._query_cache: OrderedDict = OrderedDict()
+        
+        # Embeddings test, run in the background and shared by health checks
+        self._test_executor = ThreadPoolExecutor(max_workers=1)
+        atexit.register(self._test_executor.shutdown, wait=False)
+        self._warmup_future: Optional[Future] = None
+        self._embeddings_status: Tuple[bool, str] = (False, "Embeddings not tested yet")
+        self._embeddings_checked_at = float('-inf')
+    
+    def _reset_rows(self) -> None:
+        """Empty the in-memory chunk rows."""
+        # Stored chunks, column-wise in id order: row i of each array, and
+        # of the index, describes the same chunk
+        self._texts = np.empty(0, dtype=object)
+        self._metas: List[Dict[str, Any]] = []
+        self._lengths = np.zeros(0, dtype=np.int64)
+    
+    def _append_rows(self, texts: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """
+        Append chunk rows for search results and statistics.
+        
+        Args:
+            texts (List[str]): Chunk texts
+            metadatas (List[Dict[str, Any]]): Chunk metadata, in text order
+        """
+        size = len(self._metas)
+        rows = np.empty(len(texts), dtype=object)
+        rows[:] = texts
+        self._texts = append_rows(self._texts, rows, size)
+        self._lengths = append_rows(
+            self._lengths, np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)), size
+        )
+        self._metas.extend(metadatas)
+    
+    def _load_rows(self) -> None:
+        """
+        Restore the rows of chunks already stored in Chroma.
+        
+        Texts and metadata are read from Chroma, and parent chunks from the
+        parent store. Vectors are mapped from the index file when it matches
+        the collection, and otherwise read from Chroma once and indexed again.
+        """
+        from langchain.schema import Document
+        
+        self.parents = {
+            parent_id: Document(page_content=text, metadata=metadata)
+            for parent_id, text, metadata in self.parent_store.get_all()
+        }
+        
+        collection = self.vectorstore._collection
+        stored = collection.get(include=["documents", "metadatas"])
+        if not stored["ids"]:
+            return
+        
+        # The id counter file may be missing or stale; never hand out an id
+        # that is already stored
+        numeric_ids = [int(id_) for id_ in stored["ids"] if id_.isdigit()]
+        if numeric_ids:
+            self._next_id = max(self._next_id, max(numeric_ids) + 1)
+        
+        # Index rows were written in id order
+        try:
+            order = sorted(range(len(stored["ids"])), key=lambda i: int(stored["ids"][i]))
+            ordered = True
+        except ValueError:
+            # Chunks stored before sequential ids have no recorded order
+            order = range(len(stored["ids"]))
+            ordered = False
+        
+        ids = [stored["ids"][i] for i in order]
+        self._append_rows(
+            [stored["documents"][i] for i in order],
+            [stored["metadatas"][i] or {} for i in order]
+        )
+        
+        if ordered and self.index.load(ids) and self._index_row_matches(len(ids) - 1):
+            return
+        
+        self.index.clear()
+        vectors = collection.get(ids=ids, include=["embeddings"])
+        by_id = dict(zip(vectors["ids"], vectors["embeddings"]))
+        
+        # Chunks stored before embeddings were normalized hold raw vectors
+        self.index.add(ids, normalize_rows([by_id[id_] for id_ in ids]))
+    
+    def _index_row_matches(self, row: int) -> bool:
+        """
+        Check an index row against the vector Chroma stores for its id.
+        
+        Catches an index file left behind by a run that stopped between
+        writing Chroma and writing the file.
+        
+        Args:
+            row (int): Row index
+            
+        Returns:
+            bool: True if the vectors point the same way
+        """
+        stored = self.vectorstore._collection.get(ids=[self.index.ids[row]], include=["embeddings"])
+        if len(stored["embeddings"]) == 0:
+            return False
+        expected = normalize_rows(stored["embeddings"])[0]
+        return float(self.index.vector(row) @ expected) > 0.99
+    
+    @property
+    def chunk_lengths(self) -> np.ndarray:
+        """Character length of each stored chunk."""
+        return self._lengths[:len(self._metas)]
+    
+    def _document(self, row: int) -> Any:
+        """
+        Build the Document stored in a row.
+        
+        Args:
+            row (int): Row index
+            
+        Returns:
+            Any: Document with the row's text and metadata
+        """
+        from langchain.schema import Document
+        
+        return Document(page_content=self._texts[row], metadata=self._metas[row])
     
     def initialize(self) -> Tuple[bool, str]:
         """
@@ -31,16 +217,21 @@ class VectorStoreManager:
             Tuple[bool, str]: (success, message)
         """
         try:
-            # Initialize Ollama embeddings
-            self.embeddings = OllamaEmbeddings(
+            from langchain_community.vectorstores import Chroma
+            from ollama_embeddings import OllamaBatchEmbeddings
+            
+            # Initialize Ollama embeddings; every embedding call, including
+            # Chroma's query embeddings, shares this client's HTTP session
+            self.embeddings = OllamaBatchEmbeddings(
                 model=config.ollama.model,
-                base_url=config.ollama.base_url
+                base_url=config.ollama.base_url,
+                batch_size=config.vectorstore.embed_batch_size,
+                concurrency=config.vectorstore.embed_concurrency
             )
             
-            # Test embeddings
-            test_success, test_message = self._test_embeddings()
-            if not test_success:
-                return False, test_message
+            # Test embeddings, which also loads the model in Ollama, while
+            # the stores below open
+            self._warmup_future = self._test_executor.submit(self._test_embeddings)
             
             # Initialize vector store
             self.vectorstore = Chroma(
@@ -48,6 +239,21 @@ class VectorStoreManager:
                 embedding_function=self.embeddings
             )
             
+            # Initialize embedding cache
+            self.embedding_cache = EmbeddingCache(config.vectorstore.embedding_cache_path)
+            
+            # Parent chunks are not in Chroma, so they are kept alongside it
+            self.parent_store = ParentStore(
+                os.path.join(config.vectorstore.chroma_dir, PARENT_STORE_FILE)
+            )
+            
+            self._next_id = self._load_next_id()
+            self._load_rows()
+            
+            test_success, test_message = self._warmup_future.result()
+            if not test_success:
+                return False, test_message
+            
             self.is_initialized = True
             return True, "Vector store initialized successfully"
             
@@ -57,7 +263,7 @@ class VectorStoreManager:
     
     def _test_embeddings(self) -> Tuple[bool, str]:
         """
-        Test embeddings functionality.
+        Test embeddings functionality and record the result for health checks.
         
         Returns:
             Tuple[bool, str]: (success, message)
@@ -65,19 +271,37 @@ class VectorStoreManager:
         try:
             test_embed = self.embeddings.embed_query("test")
             if not test_embed:
-                return False, "Ollama embeddings failed - make sure Ollama is running"
-            return True, "Embeddings test successful"
+                result = (False, "Ollama embeddings failed - make sure Ollama is running")
+            else:
+                result = (True, "Embeddings test successful")
             
         except Exception as e:
             error_msg = f"Ollama Error: {str(e)}. Make sure Ollama is running with 'ollama serve'"
-            return False, error_msg
+            result = (False, error_msg)
+        
+        self._embeddings_status = result
+        self._embeddings_checked_at = time.monotonic()
+        return result
     
-    def add_documents(self, documents: List[Any]) -> Tuple[bool, str]:
+    def add_documents(
+        self,
+        documents: List[Any],
+        hashes: Optional[List[str]] = None,
+        progress_cb: Optional[Callable[[int, int], None]] = None
+    ) -> Tuple[bool, str]:
         """
         Add documents to vector store.
         
+        Documents are embedded and stored in windows of
+        config.vectorstore.insert_batch_size chunks, so only one window's
+        embeddings are held in memory at a time.
+        
         Args:
             documents (List[Any]): List of document chunks to add
+            hashes (Optional[List[str]]): Content hash of each chunk, used to
+                reuse cached embeddings
+            progress_cb (Optional[Callable[[int, int], None]]): Called with
+                (chunks stored, total chunks) after each window
             
         Returns:
             Tuple[bool, str]: (success, message)
@@ -89,19 +313,187 @@ class VectorStoreManager:
             return False, "No documents provided"
         
         try:
-            # Add documents to vector store
-            self.vectorstore.add_documents(documents)
+            total = len(documents)
+            window = max(config.vectorstore.insert_batch_size, 1)
+            reused = 0
             
-            # Store documents for reference
-            self.documents.extend(documents)
+            for start in range(0, total, window):
+                end = min(start + window, total)
+                reused += self._add_window(
+                    documents[start:end],
+                    hashes[start:end] if hashes else None
+                )
+                if progress_cb:
+                    progress_cb(end, total)
             
-            success_msg = f"Added {len(documents)} document chunks to vector store"
+            success_msg = f"Added {total} document chunks to vector store"
+            if reused:
+                success_msg += f" ({reused} embeddings reused from cache)"
             return True, success_msg
             
         except Exception as e:
             error_msg = ErrorHandler.handle_processing_error(e)
             return False, error_msg
     
+    def _add_window(self, documents: List[Any], hashes: Optional[List[str]]) -> int:
+        """
+        Embed one window of documents and store it in Chroma and the index.
+        
+        Args:
+            documents (List[Any]): Document chunks in this window
+            hashes (Optional[List[str]]): Content hash of each chunk
+            
+        Returns:
+            int: Number of embeddings reused from the cache
+        """
+        texts = [doc.page_content for doc in documents]
+        
+        # Embed only the chunks missing from the cache
+        embeddings, reused = self._embed_with_cache(texts, hashes)
+        
+        # Store unit vectors so cosine scoring at query time is a plain dot product
+        embeddings = normalize_rows(embeddings)
+        
+        # Add pre-computed embeddings directly to the collection
+        # Sequential ids are shorter keys than UUIDs and need no random
+        # numbers; the range is reserved before the add, so a failed add
+        # leaves a gap rather than ids that get reused
+        start = self._next_id
+        ids = [str(i) for i in range(start, start + len(documents))]
+        self._save_next_id(start + len(documents))
+        metadatas = [doc.metadata or None for doc in documents]
+        try:
+            self.vectorstore._collection.add(
+                ids=ids,
+                embeddings=embeddings.tolist(),
+                documents=texts,
+                metadatas=metadatas if any(metadatas) else None
+            )
+            
+            # Store the chunks' rows for search and statistics
+            self._append_rows(texts, [doc.metadata or {} for doc in documents])
+            self.index.add(ids, embeddings)
+        finally:
+            # Cached results predate this window, even if it was only partly stored
+            self._query_cache.clear()
+        
+        return reused
+    
+    def _load_next_id(self) -> int:
+        """
+        Read the next chunk id saved alongside the Chroma collection.
+        
+        Returns:
+            int: Next chunk id, 0 for a new collection
+        """
+        path = os.path.join(config.vectorstore.chroma_dir, ID_COUNTER_FILE)
+        try:
+            with open(path, encoding='utf-8') as f:
+                return int(json.load(f)["next_id"])
+        except FileNotFoundError:
+            return 0
+    
+    def _save_next_id(self, next_id: int) -> None:
+        """
+        Save the next chunk id alongside the Chroma collection.
+        
+        Args:
+            next_id (int): Next chunk id
+        """
+        self._next_id = next_id
+        path = os.path.join(config.vectorstore.chroma_dir, ID_COUNTER_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding='utf-8') as f:
+            json.dump({"next_id": next_id}, f)
+        os.replace(tmp_path, path)
+    
+    def add_parents(self, parents: List[Any]) -> None:
+        """
+        Register and persist parent chunks for child-to-parent expansion.
+        
+        Args:
+            parents (List[Any]): Parent chunks carrying a 'parent_id' in metadata
+        """
+        for parent in parents:
+            self.parents[parent.metadata['parent_id']] = parent
+        
+        self.parent_store.put_many(
+            (parent.metadata['parent_id'], parent.page_content, parent.metadata)
+            for parent in parents
+        )
+    
+    def expand_to_parents(self, documents: List[Any]) -> List[Any]:
+        """
+        Replace matched child chunks with their parent chunks.
+        
+        Parents are deduplicated, keeping the rank of their best-matching
+        child. Documents without a known parent are returned unchanged.
+        
+        Args:
+            documents (List[Any]): Retrieved documents
+            
+        Returns:
+            List[Any]: Documents to use as LLM context
+        """
+        expanded = []
+        seen = set()
+        for doc in documents:
+            parent_id = doc.metadata.get('parent_id') if hasattr(doc, 'metadata') else None
+            parent = self.parents.get(parent_id)
+            if parent is None:
+                if parent_id is not None:
+                    logger.warning("Parent chunk %s not found; using the child chunk", parent_id)
+                expanded.append(doc)
+            elif parent_id not in seen:
+                seen.add(parent_id)
+                expanded.append(parent)
+        
+        return expanded
+    
+    def _embed_with_cache(self, texts: List[str], hashes: Optional[List[str]]) -> Tuple[np.ndarray, int]:
+        """
+        Embed texts, reusing cached embeddings where available.
+        
+        Args:
+            texts (List[str]): Texts to embed
+            hashes (Optional[List[str]]): Content hash of each text
+            
+        Returns:
+            Tuple[np.ndarray, int]: (embeddings in text order, number reused from cache)
+        """
+        if hashes is None or self.embedding_cache is None:
+            return self._embed_batch(texts), 0
+        
+        model = config.ollama.model
+        cached = self.embedding_cache.get_many(hashes, model)
+        
+        # Embed each uncached text once, even if it appears several times
+        missing = {}
+        for text, content_hash in zip(texts, hashes):
+            if content_hash not in cached and content_hash not in missing:
+                missing[content_hash] = text
+        
+        if missing:
+            new_embeddings = self._embed_batch(list(missing.values()))
+            fresh = dict(zip(missing.keys(), new_embeddings))
+            self.embedding_cache.put_many(fresh.items(), model)
+            cached.update(fresh)
+        
+        reused = sum(1 for content_hash in hashes if content_hash not in missing)
+        return np.stack([cached[content_hash] for content_hash in hashes]), reused
+    
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts with Ollama's batch endpoint.
+        
+        Args:
+            texts (List[str]): Texts to embed
+            
+        Returns:
+            np.ndarray: float32 embeddings, one row per text
+        """
+        return self.embeddings.embed_array(texts)
+    
     def similarity_search(self, query: str, k: Optional[int] = None) -> List[Any]:
         """
         Perform similarity search on documents.
@@ -118,44 +510,141 @@ class VectorStoreManager:
         
         try:
             k = k or config.vectorstore.similarity_search_k
-            retriever = self.vectorstore.as_retriever(
-                search_type="similarity",
-                search_kwargs={"k": k}
-            )
             
-            relevant_docs = retriever.get_relevant_documents(query)
-            return relevant_docs
+            # Repeated questions skip embedding and search entirely; case is
+            # kept, since the embedding model distinguishes "US" from "us"
+            query = query.strip()
+            key = (query, k)
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                self._query_cache.move_to_end(key)
+                return list(cached)
+            
+            if len(self.index):
+                results = self._search_index(query, k)
+            else:
+                # Query Chroma directly, skipping the retriever's callback plumbing
+                results = self.vectorstore.similarity_search(query, k=k)
+            
+            self._query_cache[key] = results
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+            return list(results)
             
         except Exception as e:
-            print(f"Similarity search error: {str(e)}")
+            _log_error("Similarity search error", e)
             return []
     
-    def get_context_from_docs(self, documents: List[Any]) -> str:
+    def _search_index(self, query: str, k: int) -> List[Any]:
         """
-        Extract context text from documents.
+        Search the in-memory index, reranking approximate results.
         
         Args:
-            documents (List[Any]): List of documents
+            query (str): Search query
+            k (int): Number of results to return
             
         Returns:
-            str: Combined context text
+            List[Any]: Most relevant documents, best first
         """
-        if not documents:
-            return ""
+        query_embedding = normalize_rows(self.embeddings.embed_query(query))[0]
+        if not self.index.approximate:
+            return [self._document(row) for row in self.index.search(query_embedding, k)]
+        
+        rows = self.index.search(query_embedding, k * config.vectorstore.rerank_factor)
+        return self._rerank(query_embedding, rows, k)
+    
+    def _rerank(self, query_embedding: np.ndarray, rows: List[int], k: int) -> List[Any]:
+        """
+        Rerank index candidates against their full-precision vectors in Chroma.
+        
+        Args:
+            query_embedding (np.ndarray): Unit-norm query embedding
+            rows (List[int]): Candidate rows from the index
+            k (int): Number of results to return
+            
+        Returns:
+            List[Any]: Best k candidate documents, best first
+        """
+        ids = [self.index.ids[row] for row in rows]
+        stored = self.vectorstore._collection.get(ids=ids, include=["embeddings"])
+        vectors = dict(zip(stored["ids"], stored["embeddings"]))
+        candidates = np.asarray([vectors[id_] for id_ in ids], dtype=np.float32)
+        
+        # Stored vectors are unit-norm, so the dot product is the cosine
+        scores = candidates @ query_embedding
+        return [self._document(rows[i]) for i in top_rows(scores, k)]
+    
+    def similarity_search_batch(self, queries: List[str], k: Optional[int] = None) -> List[List[Any]]:
+        """
+        Perform similarity search for several queries at once.
+        
+        All queries are embedded in one Ollama request and scored together,
+        with one matrix product against the in-memory index or a single
+        Chroma query, instead of one round-trip per query.
+        
+        Args:
+            queries (List[str]): Search queries
+            k (Optional[int]): Number of results to return per query
+            
+        Returns:
+            List[List[Any]]: List of relevant documents per query, in query order
+        """
+        if not self.is_initialized or not self.vectorstore or not queries:
+            return [[] for _ in queries]
         
         try:
-            context_parts = []
-            for doc in documents:
-                if hasattr(doc, 'page_content'):
-                    context_parts.append(doc.page_content)
-                elif isinstance(doc, str):
-                    context_parts.append(doc)
+            k = k or config.vectorstore.similarity_search_k
+            if len(self.index):
+                return self._search_index_batch(queries, k)
+            
+            collection = self.vectorstore._collection
+            k = min(k, collection.count())
+            if k == 0:
+                return [[] for _ in queries]
+            
+            results = collection.query(
+                query_embeddings=self._embed_batch(queries).tolist(),
+                n_results=k,
+                include=["documents", "metadatas"]
+            )
             
-            return "\n\n".join(context_parts)
+            from langchain.schema import Document
+            
+            return [
+                [
+                    Document(page_content=text, metadata=metadata or {})
+                    for text, metadata in zip(texts, metadatas)
+                ]
+                for texts, metadatas in zip(results["documents"], results["metadatas"])
+            ]
             
         except Exception as e:
-            print(f"Error extracting context: {str(e)}")
-            return ""
+            _log_error("Batch similarity search error", e)
+            return [[] for _ in queries]
+    
+    def _search_index_batch(self, queries: List[str], k: int) -> List[List[Any]]:
+        """
+        Search the in-memory index for several queries at once.
+        
+        Args:
+            queries (List[str]): Search queries
+            k (int): Number of results to return per query
+            
+        Returns:
+            List[List[Any]]: Most relevant documents per query, best first
+        """
+        query_embeddings = normalize_rows(self._embed_batch(queries))
+        if not self.index.approximate:
+            return [
+                [self._document(row) for row in rows]
+                for rows in self.index.search_many(query_embeddings, k)
+            ]
+        
+        candidates = self.index.search_many(query_embeddings, k * config.vectorstore.rerank_factor)
+        return [
+            self._rerank(query_embedding, rows, k)
+            for query_embedding, rows in zip(query_embeddings, candidates)
+        ]
     
     def clear_documents(self) -> Tuple[bool, str]:
         """
@@ -166,14 +655,20 @@ class VectorStoreManager:
         """
         try:
             # Clear in-memory documents
-            self.documents = []
+            self.parents = {}
+            self._reset_rows()
+            self.index.clear()
+            self._query_cache.clear()
             
-            # Reinitialize vector store to clear persisted data
+            # Delete the persisted chunks in place; re-creating the Chroma
+            # client would reload its index from disk
             if self.is_initialized:
-                self.vectorstore = Chroma(
-                    persist_directory=config.vectorstore.chroma_dir,
-                    embedding_function=self.embeddings
-                )
+                collection = self.vectorstore._collection
+                ids = collection.get(include=[])["ids"]
+                for i in range(0, len(ids), DELETE_BATCH_SIZE):
+                    collection.delete(ids=ids[i:i + DELETE_BATCH_SIZE])
+                self._save_next_id(0)
+                self.parent_store.clear()
             
             return True, "Documents cleared successfully"
             
@@ -188,7 +683,7 @@ class VectorStoreManager:
         Returns:
             int: Number of documents
         """
-        return len(self.documents)
+        return len(self._metas)
     
     def get_store_info(self) -> dict:
         """
@@ -199,7 +694,7 @@ class VectorStoreManager:
         """
         return {
             'is_initialized': self.is_initialized,
-            'document_count': len(self.documents),
+            'document_count': len(self._metas),
             'embedding_model': config.ollama.model,
             'chunk_size': config.vectorstore.chunk_size,
             'chunk_overlap': config.vectorstore.chunk_overlap,
@@ -207,28 +702,46 @@ class VectorStoreManager:
             'chroma_directory': config.vectorstore.chroma_dir
         }
     
+    def close(self) -> None:
+        """Release the embeddings client, the stores and the test executor."""
+        self.is_initialized = False
+        self._test_executor.shutdown(wait=False)
+        if self.embeddings:
+            self.embeddings.close()
+        if self.embedding_cache:
+            self.embedding_cache.close()
+        if self.parent_store:
+            self.parent_store.close()
+    
     def health_check(self) -> dict:
         """
         Perform health check on vector store components.
         
+        Reports the latest embeddings test instead of embedding on every
+        call; once that result is older than HEALTH_CHECK_TTL a new test is
+        started in the background for the next check.
+        
         Returns:
             dict: Health check results
         """
         health_status = {
             'vector_store_initialized': self.is_initialized,
             'embeddings_available': self.embeddings is not None,
-            'document_count': len(self.documents),
+            'document_count': len(self._metas),
             'last_error': None
         }
         
-        # Test embeddings if available
+        # Report the latest embeddings test, if available
         if self.embeddings:
-            try:
-                test_embed = self.embeddings.embed_query("health check")
-                health_status['embeddings_working'] = bool(test_embed)
-            except Exception as e:
-                health_status['embeddings_working'] = False
-                health_status['last_error'] = str(e)
+            test_running = self._warmup_future is not None and not self._warmup_future.done()
+            stale = time.monotonic() - self._embeddings_checked_at >= HEALTH_CHECK_TTL
+            if stale and not test_running:
+                self._warmup_future = self._test_executor.submit(self._test_embeddings)
+            
+            working, message = self._embeddings_status
+            health_status['embeddings_working'] = working
+            if not working:
+                health_status['last_error'] = message
         else:
             health_status['embeddings_working'] = False
         